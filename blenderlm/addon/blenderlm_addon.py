@@ -1,6 +1,7 @@
 import bpy # type: ignore
 import json
 import socket
+import struct
 import time
 from bpy.props import IntProperty # type: ignore
 import os
@@ -24,6 +25,7 @@ class BlenderLMServer:
         self.socket = None
         self.client = None
         self.buffer = b''  # Buffer for incomplete data
+        self.framed = False  # Length-prefix responses once the client asks for it
     
     def start(self):
         self.running = True
@@ -65,6 +67,7 @@ class BlenderLMServer:
                 try:
                     self.client, address = self.socket.accept()
                     self.client.setblocking(False)
+                    self.framed = False
                     print(f"Connected to client: {address}")
                 except BlockingIOError:
                     pass  # No connection waiting
@@ -85,11 +88,13 @@ class BlenderLMServer:
                                 command = json.loads(self.buffer.decode('utf-8'))
                                 # If successful, clear the buffer and process command
                                 self.buffer = b''
+                                # A set_framing reply still goes out in the old format
+                                framed = self.framed
                                 response = self.execute_command(command)
                                 
                                 # Serialize response and send in chunks if large
                                 response_json = json.dumps(response)
-                                self._send_response_in_chunks(response_json)
+                                self._send_response_in_chunks(response_json, framed)
                             except json.JSONDecodeError:
                                 # Incomplete data, keep in buffer
                                 pass
@@ -119,14 +124,16 @@ class BlenderLMServer:
             
         return 0.1  # Continue timer with 0.1 second interval
         
-    def _send_response_in_chunks(self, response_json):
-        """Send a JSON response in chunks if it's large"""
+    def _send_response_in_chunks(self, response_json, framed=False):
+        """Send a JSON response in chunks if it's large, prefixed with its length when framed"""
         if not self.client:
             return
             
         try:
             # Convert response to bytes
             response_bytes = response_json.encode('utf-8')
+            if framed:
+                response_bytes = struct.pack('>I', len(response_bytes)) + response_bytes
             total_size = len(response_bytes)
             
             # If response is small enough, send it all at once
@@ -207,6 +214,8 @@ class BlenderLMServer:
             "capture_viewport": self.capture_viewport,
             "clear_scene": self.clear_scene,
             "add_camera": self.add_camera,
+            "batch": self.batch,
+            "set_framing": self.set_framing,
             # Project management commands
             "new_project": self.new_project,
             "load_project": self.load_project,
@@ -230,6 +239,18 @@ class BlenderLMServer:
             return {"status": "error", "message": f"Unknown command type: {cmd_type}"}
 
     
+    def set_framing(self, enabled=True):
+        """Switch later responses on this connection to 4-byte length-prefixed messages"""
+        self.framed = bool(enabled)
+        return {"framed": self.framed}
+
+    def batch(self, ops):
+        """Run several commands in one request, returning one response per command"""
+        return [
+            self.execute_command({"type": op.get("type"), "params": op.get("params", {})})
+            for op in ops
+        ]
+
     def get_simple_info(self):
         """Get basic Blender information"""
         return {
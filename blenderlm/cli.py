@@ -46,11 +46,15 @@ def serve(
     blender_port: int = 9876,
     log_level: str = "info",
     reload: Annotated[bool, typer.Option("--reload")] = False,
+    timeout_keep_alive: int = 75,
+    backlog: int = 2048,
+    access_log: bool = True,
 ):
     """
     Start the BlenderLM API server.
     
     This server provides a REST API that allows LLM agents to control Blender.
+    uvloop and httptools are used automatically when installed (pip install "blenderlm[speedups]").
     """
     print_banner()
     
@@ -86,6 +90,11 @@ def serve(
             log_level=log_level,
             reload=reload,
             env_file=env_file_path,
+            # Keep idle client connections open longer than the client's pool expiry
+            timeout_keep_alive=timeout_keep_alive,
+            backlog=backlog,
+            # Per-request access lines are noisy under load; --no-access-log turns them off
+            access_log=access_log,
         )
     except KeyboardInterrupt:
         console.print("\n[bold yellow]Server stopped[/bold yellow]")
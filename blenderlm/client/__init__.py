@@ -1,21 +1,35 @@
 from .tools import (
     get_blender_tools,
+    BlenderTools,
     create_blender_object,
     # modify_blender_object,
     delete_blender_object,
     set_blender_material,
     render_blender_scene,
     get_blender_scene_info,
+    run_blender_batch,
+    create_blender_objects_bulk,
+    get_shared_client,
+    aclose_shared_clients,
+    bulk,
+    run_parallel,
 )
 from .client import BlenderLMClient 
 
 __all__ = [
     'get_blender_tools',
+    'BlenderTools',
     'create_blender_object',
     # 'modify_blender_object',
     'delete_blender_object',
     'set_blender_material',
     'render_blender_scene',
     'get_blender_scene_info',
+    'run_blender_batch',
+    'create_blender_objects_bulk',
+    'get_shared_client',
+    'aclose_shared_clients',
+    'bulk',
+    'run_parallel',
     'BlenderLMClient', 
 ]
\ No newline at end of file
@@ -1,17 +1,52 @@
+import copy
+import functools
 import inspect
 import json
 import asyncio
+import logging
+import types
+import typing
 from typing import Callable, Optional, Dict, Any, List, Union
 from openai.types.chat import ChatCompletionToolParam, ChatCompletionUserMessageParam
 from PIL import Image
 
+logger = logging.getLogger("blenderlm.agents")
+
 # --- TOOL SCHEMA GENERATION ---
+# Client plumbing the model never chooses; execute_tool fills these in
+CLIENT_PARAMS: Dict[str, Any] = {"session_id": None, "wait_for_result": True, "depends_on": None}
+
+_UNION_TYPES = (Union, getattr(types, "UnionType", Union))
+_JSON_TYPES = {int: "integer", float: "number", bool: "boolean", str: "string", list: "array", dict: "object"}
+
+def _param_schema(annotation: Any, nullable: bool) -> Dict[str, Any]:
+    """Map a parameter annotation to a JSON schema; Optional[X] and defaulted parameters accept null"""
+    args = typing.get_args(annotation)
+    if typing.get_origin(annotation) in _UNION_TYPES and type(None) in args:
+        nullable = True
+        rest = [arg for arg in args if arg is not type(None)]
+        annotation = rest[0] if len(rest) == 1 else inspect.Parameter.empty
+    origin = typing.get_origin(annotation) or annotation
+    schema: Dict[str, Any] = {"type": _JSON_TYPES.get(origin, "string")}
+    if schema["type"] == "array":
+        item_args = typing.get_args(annotation)
+        schema["items"] = {"type": _JSON_TYPES.get(item_args[0], "string") if item_args else "string"}
+    if nullable:
+        schema["type"] = [schema["type"], "null"]
+    return schema
+
 def generate_tool_schema(func: Callable) -> Optional[ChatCompletionToolParam]:
     """
     Generate OpenAI function schema from a Python function.
     This is a basic implementation - you may want to enhance it with more sophisticated
     type inference or use a library like pydantic for better schema generation.
+    Schemas are cached per function, so every agent reuses the first introspection;
+    each caller gets its own copy.
     """
+    return copy.deepcopy(_cached_tool_schema(func))
+
+@functools.lru_cache(maxsize=None)
+def _cached_tool_schema(func: Callable) -> Optional[ChatCompletionToolParam]:
     try:
         sig = inspect.signature(func)
         parameters = {
@@ -21,22 +56,13 @@ def generate_tool_schema(func: Callable) -> Optional[ChatCompletionToolParam]:
             "additionalProperties": False
         }
         for param_name, param in sig.parameters.items():
-            param_info = {"type": "string", "description": f"Parameter {param_name}"}
-            # Basic type inference
-            if param.annotation != inspect.Parameter.empty:
-                if param.annotation == int:
-                    param_info["type"] = "integer"
-                elif param.annotation == float:
-                    param_info["type"] = "number"
-                elif param.annotation == bool:
-                    param_info["type"] = "boolean"
-                elif param.annotation == list:
-                    param_info["type"] = "array"
-                elif param.annotation == dict:
-                    param_info["type"] = "object"
+            if param_name in CLIENT_PARAMS:
+                continue
+            # Strict mode requires every property, so optional ones are nullable instead
+            param_info = _param_schema(param.annotation, nullable=param.default is not inspect.Parameter.empty)
+            param_info["description"] = f"Parameter {param_name}"
             parameters["properties"][param_name] = param_info
-            if param.default == inspect.Parameter.empty:
-                parameters["required"].append(param_name)
+            parameters["required"].append(param_name)
         return ChatCompletionToolParam(
             type="function",
             function={
@@ -47,7 +73,7 @@ def generate_tool_schema(func: Callable) -> Optional[ChatCompletionToolParam]:
             }
         )
     except Exception as e:
-        print(f"Warning: Could not generate schema for function {func.__name__}: {e}")
+        logger.warning("Could not generate schema for function %s: %s", func.__name__, e)
         return None
 
 # --- TOOL EXECUTION ---
@@ -57,6 +83,15 @@ async def execute_tool(tool_map: Dict[str, Callable], tool_name: str, tool_args:
         return f"Error: Tool '{tool_name}' not found"
     tool_func = tool_map[tool_name]
     try:
+        params = inspect.signature(tool_func).parameters
+        # A null for a defaulted parameter means "use the default"
+        tool_args = {
+            name: value for name, value in tool_args.items()
+            if value is not None or name not in params or params[name].default is inspect.Parameter.empty
+        }
+        for name, value in CLIENT_PARAMS.items():
+            if name in params and name not in tool_args:
+                tool_args[name] = value
         # print(f"Executing tool: {tool_name} with args: {tool_args}")
         if asyncio.iscoroutinefunction(tool_func):
             result = await tool_func(**tool_args)
@@ -69,9 +104,8 @@ async def execute_tool(tool_map: Dict[str, Callable], tool_name: str, tool_args:
         else:
             return str(result)
     except Exception as e:
-        error_msg = f"Error executing tool {tool_name}: {str(e)}"
-        print(error_msg)
-        return error_msg
+        logger.warning("Tool %s failed: %s", tool_name, e)
+        return f"Error executing tool {tool_name}: {str(e)}"
 
 # --- AGENT TASK TO OAI USER MESSAGE ---
 def agent_task_to_oai_user_message(task) -> Union[ChatCompletionUserMessageParam, None]:
@@ -97,7 +131,7 @@ def agent_task_to_oai_user_message(task) -> Union[ChatCompletionUserMessageParam
                     "image_url": {"url": f"data:image/png;base64,{img_str}"}
                 })
             else:
-                print(f"Warning: Unsupported type in task list: {type(item)}. Skipping.")
+                logger.warning("Unsupported type in task list: %s. Skipping.", type(item))
         if content:
             return ChatCompletionUserMessageParam(role="user", content=content)
         else:
@@ -106,7 +140,7 @@ def agent_task_to_oai_user_message(task) -> Union[ChatCompletionUserMessageParam
         # AgentTask object
         return agent_task_to_oai_user_message(task.content)
     else:
-        print(f"Warning: Unsupported task type: {type(task)}")
+        logger.warning("Unsupported task type: %s", type(task))
         return None
 
 async def get_blender_scene_state() -> ChatCompletionUserMessageParam:
@@ -117,9 +151,12 @@ async def get_blender_scene_state() -> ChatCompletionUserMessageParam:
     """
     from blenderlm.client.client import BlenderLMClient
     client = BlenderLMClient()
-    scene_info = await client.get_scene_info(wait_for_result=True)
+    # Scene info and viewport capture are independent, so submit and await them together
+    scene_info, scene_image = await asyncio.gather(
+        client.get_scene_info(wait_for_result=True),
+        client.capture_viewport(camera_view=False, return_base64=True, wait_for_result=True),
+    )
     scene_status_prompt = f"The current status of the blender scene is as follows: \n{str(scene_info)}\n"
-    scene_image = await client.capture_viewport(camera_view=False, return_base64=True, wait_for_result=True)
     return ChatCompletionUserMessageParam(
         role="user",
         content=[
@@ -1,8 +1,56 @@
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from . import tools
 
 
+class JobPipeline:
+    """
+    Chains job submissions so each job runs on the server only after the previous
+    one has finished. Only the final job is awaited by the client.
+
+    Usage:
+        async with client.pipeline() as pipe:
+            await pipe.run(client.create_object, obj_type="CUBE", name="Cube")
+            await pipe.run(client.set_material, object_name="Cube", color=[1, 0, 0, 1])
+        result = pipe.result
+    """
+
+    def __init__(self, client: "BlenderLMClient") -> None:
+        self._client = client
+        self.job_ids: List[str] = []
+        self.result: Any = None
+
+    @property
+    def last_job_id(self) -> Optional[str]:
+        return self.job_ids[-1] if self.job_ids else None
+
+    async def run(self, method: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Submit a client method as the next job in the chain without waiting for it.
+        """
+        job = await method(*args, wait_for_result=False, depends_on=self.last_job_id, **kwargs)
+        self.job_ids.append(job["job_id"])
+        return job
+
+    async def wait(self) -> Any:
+        """
+        Wait for the last job in the chain and return its result.
+        """
+        if self.last_job_id is None:
+            return None
+        self.result = await tools._wait_for_job_completion(
+            self.last_job_id, tools.default_api_url, self._client.session_id
+        )
+        return self.result
+
+    async def __aenter__(self) -> "JobPipeline":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.wait()
+
+
 class BlenderLMClient:
     """
     A client for interacting with the BlenderLM API server.
@@ -13,17 +61,29 @@ class BlenderLMClient:
         self.api_url = api_url  # Kept for compatibility, but not used in tools
         self.session_id = session_id
 
-    async def get_info(self, wait_for_result: bool = True) -> Any:
+    async def __aenter__(self) -> "BlenderLMClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Close the pooled connection used by this client's session.
+        """
+        await tools.aclose_shared_client(tools.default_api_url, self.session_id)
+
+    async def get_info(self, wait_for_result: bool = True, depends_on: Optional[str] = None) -> Any:
         """
         Get basic information about the Blender instance.
         """
-        return await tools.get_blender_scene_info(session_id=self.session_id, wait_for_result=wait_for_result)
+        return await tools.get_blender_scene_info(session_id=self.session_id, wait_for_result=wait_for_result, depends_on=depends_on)
 
-    async def get_scene_info(self, wait_for_result: bool = True) -> Any:
+    async def get_scene_info(self, wait_for_result: bool = True, depends_on: Optional[str] = None) -> Any:
         """
         Get information about the current scene.
         """
-        return await tools.get_blender_scene_info(session_id=self.session_id, wait_for_result=wait_for_result)
+        return await tools.get_blender_scene_info(session_id=self.session_id, wait_for_result=wait_for_result, depends_on=depends_on)
 
     async def create_object(
         self,
@@ -34,6 +94,7 @@ class BlenderLMClient:
         scale: Optional[List[float]] = None,
         color: Optional[List[float]] = None,
         wait_for_result: bool = True,
+        depends_on: Optional[str] = None,
     ) -> Any:
         """
         Create a new object in Blender.
@@ -47,6 +108,7 @@ class BlenderLMClient:
             location_z=location_z,
             session_id=self.session_id,
             wait_for_result=wait_for_result,
+            depends_on=depends_on,
         )
 
     async def modify_object(
@@ -57,11 +119,12 @@ class BlenderLMClient:
         scale: Optional[List[float]] = None,
         visible: Optional[bool] = None,
         wait_for_result: bool = True,
+        depends_on: Optional[str] = None,
     ) -> Any:
         # Not implemented in tools.py; placeholder for future extension
         raise NotImplementedError("modify_object is not implemented in tools.py")
 
-    async def delete_object(self, name: str, wait_for_result: bool = True) -> Any:
+    async def delete_object(self, name: str, wait_for_result: bool = True, depends_on: Optional[str] = None) -> Any:
         """
         Delete an object from Blender.
         """
@@ -69,6 +132,7 @@ class BlenderLMClient:
             name=name,
             session_id=self.session_id,
             wait_for_result=wait_for_result,
+            depends_on=depends_on,
         )
 
     async def set_material(
@@ -77,6 +141,7 @@ class BlenderLMClient:
         color: Optional[List[float]] = None,
         material_name: Optional[str] = None,
         wait_for_result: bool = True,
+        depends_on: Optional[str] = None,
     ) -> Any:
         """
         Set a material for an object.
@@ -87,6 +152,7 @@ class BlenderLMClient:
             material_name=material_name,
             session_id=self.session_id,
             wait_for_result=wait_for_result,
+            depends_on=depends_on,
         )
 
     async def render_scene(
@@ -95,6 +161,7 @@ class BlenderLMClient:
         resolution_x: Optional[int] = None,
         resolution_y: Optional[int] = None,
         wait_for_result: bool = True,
+        depends_on: Optional[str] = None,
     ) -> Any:
         """
         Render the current scene.
@@ -105,9 +172,10 @@ class BlenderLMClient:
             resolution_y=resolution_y,
             session_id=self.session_id,
             wait_for_result=wait_for_result,
+            depends_on=depends_on,
         )
 
-    async def execute_code(self, code: str, wait_for_result: bool = True) -> Any:
+    async def execute_code(self, code: str, wait_for_result: bool = True, depends_on: Optional[str] = None) -> Any:
         """
         Execute arbitrary Python code in Blender.
         """
@@ -115,6 +183,7 @@ class BlenderLMClient:
             code=code,
             session_id=self.session_id,
             wait_for_result=wait_for_result,
+            depends_on=depends_on,
         )
 
     async def capture_viewport(
@@ -122,24 +191,42 @@ class BlenderLMClient:
         camera_view: Optional[bool] = None,
         return_base64: Optional[bool] = True,
         wait_for_result: bool = True,
+        depends_on: Optional[str] = None,
+        stream: bool = False,
+        raw: bool = False,
     ) -> Any:
         """
         Capture the current viewport using OpenGL rendering.
+        With return_base64=False the job result carries only the image "filepath".
+        With raw=True the image is downloaded from the server and returned under "image_bytes".
+        With stream=True the full-size image is streamed from the server and
+        base64-encoded client-side instead of being embedded in the job result.
+        Downloads need the API server to be able to read Blender's output file; when
+        it cannot, the job result with "filepath" is returned instead.
         """
+        if (stream or raw) and wait_for_result:
+            return await tools.capture_viewport_image(
+                camera_view=camera_view,
+                session_id=self.session_id,
+                depends_on=depends_on,
+                as_base64=bool(return_base64 and not raw),
+            )
         return await tools.capture_viewport( 
             camera_view=camera_view,
             return_base64=return_base64,
             session_id=self.session_id,
             wait_for_result=wait_for_result,
+            depends_on=depends_on,
         )
 
-    async def clear_scene(self, wait_for_result: bool = True) -> Any:
+    async def clear_scene(self, wait_for_result: bool = True, depends_on: Optional[str] = None) -> Any:
         """
         Clear all objects from the scene.
         """
         return await tools.clear_blender_scene(
             session_id=self.session_id,
             wait_for_result=wait_for_result,
+            depends_on=depends_on,
         )
 
     async def add_camera(
@@ -147,6 +234,7 @@ class BlenderLMClient:
         location: Optional[List[float]] = None,
         rotation: Optional[List[float]] = None,
         wait_for_result: bool = True,
+        depends_on: Optional[str] = None,
     ) -> Any:
         """
         Add a camera to the scene.
@@ -156,8 +244,31 @@ class BlenderLMClient:
             rotation=rotation,
             session_id=self.session_id,
             wait_for_result=wait_for_result,
+            depends_on=depends_on,
+        )
+
+    async def batch(
+        self,
+        ops: List[Dict[str, Any]],
+        wait_for_result: bool = True,
+        depends_on: Optional[str] = None,
+    ) -> Any:
+        """
+        Run several commands, given as {"type": ..., "params": {...}}, as one job.
+        """
+        return await tools.run_blender_batch(
+            ops,
+            session_id=self.session_id,
+            wait_for_result=wait_for_result,
+            depends_on=depends_on,
         )
 
+    def pipeline(self) -> JobPipeline:
+        """
+        Create a pipeline that chains jobs server-side and awaits only the last one.
+        """
+        return JobPipeline(self)
+
     @staticmethod
     def get_blender_tools():
         """
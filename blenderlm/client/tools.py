@@ -1,20 +1,211 @@
+import asyncio
+import atexit
+import base64
+import copy
+import importlib.util
+import logging
 import os
+import random
+import time
+import weakref
+from dataclasses import dataclass
 import httpx
-from typing import Dict, List, Optional, Any, Callable
-from pydantic import BaseModel
+import orjson
+from typing import Awaitable, Dict, List, Optional, Any, Callable, Set, Tuple
+from pydantic import BaseModel, Field, computed_field, model_validator
 
-default_api_url = os.environ.get("BLENDERLM_TOOL_URL", "http://localhost:8199")
+try:
+    import websockets
+except ImportError:  # Optional: job completions pushed over one WebSocket
+    websockets = None
+
+logger = logging.getLogger("blenderlm.client")
+
+@dataclass(frozen=True)
+class ClientConfig:
+    """
+    Tool client settings, read and validated once from the environment at import.
+    """
+    api_url: str = "http://localhost:8199"
+
+    @classmethod
+    def from_env(cls) -> "ClientConfig":
+        api_url = os.environ.get("BLENDERLM_TOOL_URL", cls.api_url).rstrip("/")
+        url = httpx.URL(api_url)
+        if url.scheme not in ("http", "https") or not url.host:
+            raise ValueError(f"BLENDERLM_TOOL_URL must be an absolute http(s) URL, got {api_url!r}")
+        return cls(api_url=api_url)
+
+try:
+    _CONFIG = ClientConfig.from_env()
+except (ValueError, httpx.InvalidURL) as e:
+    # A bad client setting must not stop importers, such as the API server, from loading
+    logger.warning("%s; using %s", e, ClientConfig.api_url)
+    _CONFIG = ClientConfig()
+default_api_url = _CONFIG.api_url
+
+# API endpoint paths, relative to the shared client's base_url
+_OBJECTS_PATH = "/api/blender/objects"
+_MATERIALS_PATH = "/api/blender/materials"
+_RENDER_PATH = "/api/blender/render"
+_SCENE_PATH = "/api/blender/scene"
+_SCENE_CLEAR_PATH = "/api/blender/scene/clear"
+_VIEWPORT_PATH = "/api/blender/viewport"
+_CODE_PATH = "/api/blender/code"
+_CAMERA_PATH = "/api/blender/camera"
+_BATCH_PATH = "/api/blender/batch"
+_JOBS_PATH = "/api/jobs"
+_JOBS_WS_PATH = "/api/jobs/ws"
+_JSON_HEADERS = {"content-type": "application/json"}
+# Vectors may be passed as tuples or numpy arrays; orjson writes both as JSON arrays
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+# How long the server may hold a submit request for the job to finish (wait_for_result only)
+_SUBMIT_WAIT_MS = 200
+
+# Pooled clients keyed by (API base URL, session ID), so tool calls reuse keep-alive
+# connections instead of paying a TCP handshake per request. The session header is
+# set once on the client rather than on every request.
+_CLIENTS: Dict[Tuple[str, Optional[str]], httpx.AsyncClient] = {}
+_POOL_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0)
+_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+# Multiplex concurrent requests over one connection when h2 is installed and the
+# server negotiates HTTP/2; otherwise httpx stays on HTTP/1.1 keep-alive.
+_HTTP2 = importlib.util.find_spec("h2") is not None
+# Event streams stay open until the job finishes, so only the connect phase is bounded
+_STREAM_TIMEOUT = httpx.Timeout(None, connect=5.0)
+
+# Job-completion WebSocket subscribers per event loop and API base URL; a WebSocket
+# can only be used from the loop that opened it
+_SUBSCRIBERS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _JobSubscriber]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Completed scene reads served again within a short window to absorb bursts of
+# back-to-back checks; cleared by any mutating request
+_READ_TTL = 0.1
+_RECENT_READS: Dict[Tuple[Any, ...], Tuple[float, Any]] = {}
+_mutation_generation = 0
+
+# In-flight idempotent requests and job waits, keyed by request identity, for single-flight dedup
+_INFLIGHT: Dict[Tuple[Any, ...], "asyncio.Future[Any]"] = {}
+
+
+def get_shared_client(api_url: str = default_api_url, session_id: Optional[str] = None) -> httpx.AsyncClient:
+    """
+    Return the shared httpx client for the given API URL and session, creating it on first use.
+    Args:
+        api_url: Base URL of the BlenderLM API server.
+        session_id: Optional session ID sent as a default header on every request.
+    Returns:
+        A pooled httpx.AsyncClient with base_url set to api_url.
+    """
+    key = (api_url, session_id)
+    client = _CLIENTS.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=api_url,
+            headers=_session_headers(session_id),
+            limits=_POOL_LIMITS,
+            timeout=_TIMEOUT,
+            http2=_HTTP2,
+        )
+        _CLIENTS[key] = client
+    return client
+
+
+async def aclose_shared_clients() -> None:
+    """
+    Close all shared httpx clients. Call this on application shutdown.
+    """
+    clients = list(_CLIENTS.values())
+    _CLIENTS.clear()
+    for client in clients:
+        await client.aclose()
+    subscribers = _SUBSCRIBERS.pop(asyncio.get_running_loop(), {})
+    for subscriber in subscribers.values():
+        await subscriber.aclose()
+
+
+async def aclose_shared_client(api_url: str = default_api_url, session_id: Optional[str] = None) -> None:
+    """
+    Close the shared httpx client for one API URL and session, if open.
+    A later call for the same session transparently opens a new one.
+    """
+    client = _CLIENTS.pop((api_url, session_id), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def close() -> None:
+    """
+    Close the pooled HTTP connections used by the tool functions.
+    """
+    await aclose_shared_clients()
+
+
+@atexit.register
+def _close_shared_clients_at_exit() -> None:
+    if not _CLIENTS:
+        return
+    try:
+        asyncio.run(aclose_shared_clients())
+    except Exception:
+        # The event loop the connections were bound to is already gone; the OS
+        # reclaims the sockets on exit.
+        _CLIENTS.clear()
 
 class CaptureViewPortResult(BaseModel):
     """
     Result of capturing the viewport.
-    Contains either a file path or base64 encoded image data.
+    Contains a file path and the raw image data. Inline base64 from the server is
+    decoded on input; dumps carry the image as image_base64 rather than raw bytes.
     """
     filepath: str | None = None
     status: str | None = None
-    image_base64: str | None = None 
+    image_bytes: bytes | None = Field(default=None, exclude=True)
     message: str | None = None
 
+    @model_validator(mode="before")
+    @classmethod
+    def _decode_inline_image(cls, data: Any) -> Any:
+        if isinstance(data, dict) and data.get("image_base64") and not data.get("image_bytes"):
+            data = dict(data)
+            data["image_bytes"] = base64.b64decode(data.pop("image_base64"))
+        return data
+
+    @computed_field
+    @property
+    def image_base64(self) -> str | None:
+        if self.image_bytes is None:
+            return None
+        return base64.b64encode(self.image_bytes).decode("ascii")
+
+class JobResult:
+    """
+    Status, result and error of a job as reported by the job endpoint or event stream.
+    Slotted so the wait loops read fixed attributes rather than dict keys.
+    """
+    __slots__ = ("status", "result", "error")
+
+    def __init__(self, status: str, result: Any = None, error: Optional[str] = None):
+        self.status = status
+        self.result = result
+        self.error = error
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "JobResult":
+        return cls(payload["status"], payload.get("result"), payload.get("error"))
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def unwrap(self) -> Any:
+        """Return the result of a completed job, raising if the job failed."""
+        if self.status == "failed":
+            raise Exception(f"Job failed: {self.error or 'Unknown error'}")
+        return self.result
+
 async def create_blender_object(
     type: str,
     name: Optional[str],
@@ -23,6 +214,7 @@ async def create_blender_object(
     location_z: Optional[float],
     session_id: Optional[str],
     wait_for_result: bool,
+    depends_on: Optional[str] = None,
 ) -> Any:
     """
     Create a new object in Blender.
@@ -34,28 +226,21 @@ async def create_blender_object(
         location_z: Optional Z coordinate.
         session_id: Optional session ID for Blender connection.
         wait_for_result: Whether to wait for job completion.
+        depends_on: Optional job ID the server must finish before running this job.
     Returns:
         The created object info or job info.
     """
-    api_url = default_api_url
-    data: Dict[str, Any] = {"type": type}
-    if name:
-        data["name"] = name
-    if None not in (location_x, location_y, location_z):
-        data["location"] = [location_x, location_y, location_z]
-    headers = {"session_id": session_id} if session_id else {}
-    async with httpx.AsyncClient() as client:
-        response = await client.post(f"{api_url}/api/blender/objects", json=data, headers=headers)
-        response.raise_for_status()
-        result = response.json()
-    if wait_for_result and "job_id" in result:
-        result = await _wait_for_job_completion(result["job_id"], api_url, session_id)
-    return result if wait_for_result else result
+    return await _call(
+        "POST", _OBJECTS_PATH,
+        {"type": type, "name": name or None, "location": _xyz(location_x, location_y, location_z)},
+        session_id, wait_for_result, depends_on,
+    )
 
 async def delete_blender_object(
     name: str,
     session_id: Optional[str],
     wait_for_result: bool,
+    depends_on: Optional[str] = None,
 ) -> Any:
     """
     Delete an object from Blender.
@@ -63,18 +248,11 @@ async def delete_blender_object(
         name: Name of the object to delete.
         session_id: Optional session ID for Blender connection.
         wait_for_result: Whether to wait for job completion.
+        depends_on: Optional job ID the server must finish before running this job.
     Returns:
         Deletion result or job info.
     """
-    api_url = default_api_url
-    headers = {"session_id": session_id} if session_id else {}
-    async with httpx.AsyncClient() as client:
-        response = await client.delete(f"{api_url}/api/blender/objects/{name}", headers=headers)
-        response.raise_for_status()
-        result = response.json()
-    if wait_for_result and "job_id" in result:
-        result = await _wait_for_job_completion(result["job_id"], api_url, session_id)
-    return result if wait_for_result else result
+    return await _call("DELETE", f"{_OBJECTS_PATH}/{name}", None, session_id, wait_for_result, depends_on)
 
 async def set_blender_material(
     object_name: str,
@@ -82,6 +260,7 @@ async def set_blender_material(
     material_name: Optional[str],
     session_id: Optional[str],
     wait_for_result: bool,
+    depends_on: Optional[str] = None,
 ) -> Any:
     """
     Set a material for an object in Blender.
@@ -91,23 +270,15 @@ async def set_blender_material(
         material_name: Optional name for the material.
         session_id: Optional session ID for Blender connection.
         wait_for_result: Whether to wait for job completion.
+        depends_on: Optional job ID the server must finish before running this job.
     Returns:
         Material application result or job info.
     """
-    api_url = default_api_url
-    data: Dict[str, Any] = {"object_name": object_name}
-    if color:
-        data["color"] = color
-    if material_name:
-        data["material_name"] = material_name
-    headers = {"session_id": session_id} if session_id else {}
-    async with httpx.AsyncClient() as client:
-        response = await client.post(f"{api_url}/api/blender/materials", json=data, headers=headers)
-        response.raise_for_status()
-        result = response.json()
-    if wait_for_result and "job_id" in result:
-        result = await _wait_for_job_completion(result["job_id"], api_url, session_id)
-    return result if wait_for_result else result
+    return await _call(
+        "POST", _MATERIALS_PATH,
+        {"object_name": object_name, "color": color or None, "material_name": material_name or None},
+        session_id, wait_for_result, depends_on,
+    )
 
 async def render_blender_scene(
     output_path: Optional[str],
@@ -115,6 +286,7 @@ async def render_blender_scene(
     resolution_y: Optional[int],
     session_id: Optional[str],
     wait_for_result: bool,
+    depends_on: Optional[str] = None,
 ) -> Any:
     """
     Render the current Blender scene.
@@ -124,53 +296,56 @@ async def render_blender_scene(
         resolution_y: Optional height in pixels.
         session_id: Optional session ID for Blender connection.
         wait_for_result: Whether to wait for job completion.
+        depends_on: Optional job ID the server must finish before running this job.
     Returns:
         Render result or job info.
     """
-    api_url = default_api_url
-    data = {}
-    if output_path:
-        data["output_path"] = output_path
-    if resolution_x:
-        data["resolution_x"] = resolution_x
-    if resolution_y:
-        data["resolution_y"] = resolution_y
-    headers = {"session_id": session_id} if session_id else {}
-    async with httpx.AsyncClient() as client:
-        response = await client.post(f"{api_url}/api/blender/render", json=data, headers=headers)
-        response.raise_for_status()
-        result = response.json()
-    if wait_for_result and "job_id" in result:
-        result = await _wait_for_job_completion(result["job_id"], api_url, session_id)
-    return result if wait_for_result else result
+    return await _call(
+        "POST", _RENDER_PATH,
+        {
+            "output_path": output_path or None,
+            "resolution_x": resolution_x or None,
+            "resolution_y": resolution_y or None,
+        },
+        session_id, wait_for_result, depends_on,
+    )
 
 async def get_blender_scene_info(
     session_id: Optional[str],
     wait_for_result: bool,
+    depends_on: Optional[str] = None,
 ) -> Any:
     """
     Get information about the current Blender scene.
     Args:
         session_id: Optional session ID for Blender connection.
         wait_for_result: Whether to wait for job completion.
+        depends_on: Optional job ID the server must finish before running this job.
     Returns:
         Scene info as a dict or job info.
     """
-    api_url = default_api_url
-    headers = {"session_id": session_id} if session_id else {}
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{api_url}/api/blender/scene", headers=headers)
-        response.raise_for_status()
-        scene = response.json()
-    if wait_for_result and "job_id" in scene:
-        scene = await _wait_for_job_completion(scene["job_id"], api_url, session_id)
-    return scene if wait_for_result else scene
+    key = ("GET", _SCENE_PATH, session_id, wait_for_result, depends_on)
+    cacheable = wait_for_result and depends_on is None
+    if cacheable:
+        cached = _RECENT_READS.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return copy.deepcopy(cached[1])
+    generation = _mutation_generation
+    # Concurrent identical reads share one request; each caller gets its own copy of
+    # the result so one caller's edits cannot leak into another's
+    result = await _single_flight(
+        key, lambda: _call("GET", _SCENE_PATH, None, session_id, wait_for_result, depends_on)
+    )
+    if cacheable and generation == _mutation_generation:
+        _RECENT_READS[key] = (time.monotonic() + _READ_TTL, result)
+    return copy.deepcopy(result)
 
 async def capture_viewport( 
     camera_view: Optional[bool],
     return_base64: Optional[bool],
     session_id: Optional[str],
     wait_for_result: bool,
+    depends_on: Optional[str] = None,
 ) -> Any:
     """
     Capture the current Blender viewport as an image.
@@ -180,29 +355,100 @@ async def capture_viewport(
         return_base64: Whether to return the image as base64.
         session_id: Optional session ID for Blender connection.
         wait_for_result: Whether to wait for job completion.
+        depends_on: Optional job ID the server must finish before running this job.
     Returns:
         Viewport capture result or job info.
     """
-    api_url = default_api_url
-    data = {}
-    
-    if camera_view is not None:
-        data["camera_view"] = camera_view
-    if return_base64 is not None:
-        data["return_base64"] = return_base64
-    headers = {"session_id": session_id} if session_id else {}
-    async with httpx.AsyncClient() as client:
-        response = await client.post(f"{api_url}/api/blender/viewport", json=data, headers=headers)
+    return await _call(
+        "POST", _VIEWPORT_PATH,
+        {"camera_view": camera_view, "return_base64": return_base64},
+        session_id, wait_for_result, depends_on,
+    )
+
+async def capture_viewport_image(
+    camera_view: Optional[bool],
+    session_id: Optional[str],
+    depends_on: Optional[str] = None,
+    as_base64: bool = False,
+) -> Dict[str, Any]:
+    """
+    Capture the current Blender viewport and return the raw image bytes.
+    The image is fetched as a binary response instead of base64 inside JSON.
+    Args:
+        camera_view: Whether to switch to camera view before capture.
+        session_id: Optional session ID for Blender connection.
+        depends_on: Optional job ID the server must finish before running this job.
+        as_base64: Return the image base64-encoded under "image_base64" instead,
+            encoding it while it streams in.
+    Returns:
+        Viewport capture result with the image under "image_bytes" or "image_base64",
+        or with only its "filepath" if the server cannot serve the image.
+    """
+    job = await capture_viewport(
+        camera_view=camera_view,
+        return_base64=False,
+        session_id=session_id,
+        wait_for_result=False,
+        depends_on=depends_on,
+    )
+    result = await _wait_for_job_completion(job["job_id"], default_api_url, session_id)
+    if result.get("status") == "success":
+        try:
+            if as_base64:
+                result["image_base64"] = await get_job_image_base64(job["job_id"], session_id)
+            else:
+                result["image_bytes"] = await get_job_image(job["job_id"], session_id)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 404:
+                raise
+            # The API server cannot read the file (e.g. Blender runs on another host or
+            # with another temp dir); the result still carries its filepath
+    return result
+
+async def get_job_image(job_id: str, session_id: Optional[str]) -> bytes:
+    """
+    Download the image produced by a finished viewport capture or render job.
+    Args:
+        job_id: ID of the completed job.
+        session_id: Optional session ID for Blender connection.
+    Returns:
+        The raw image bytes.
+    """
+    client = get_shared_client(default_api_url, session_id)
+    response = await client.get(f"{_JOBS_PATH}/{job_id}/image")
+    response.raise_for_status()
+    return response.content
+
+async def get_job_image_base64(job_id: str, session_id: Optional[str], chunk_size: int = 65536) -> str:
+    """
+    Download a job's image and base64-encode it as it streams in, so the raw
+    image is never buffered whole.
+    Args:
+        job_id: ID of the completed job.
+        session_id: Optional session ID for Blender connection.
+        chunk_size: Size of the chunks read from the response.
+    Returns:
+        The image as a base64 string.
+    """
+    client = get_shared_client(default_api_url, session_id)
+    encoded: List[bytes] = []
+    pending = b""
+    async with client.stream("GET", f"{_JOBS_PATH}/{job_id}/image") as response:
         response.raise_for_status()
-        result = response.json()
-    if wait_for_result and "job_id" in result:
-        result = await _wait_for_job_completion(result["job_id"], api_url, session_id)
-    return result if wait_for_result else result
+        async for chunk in response.aiter_bytes(chunk_size):
+            pending += chunk
+            # Encode only whole 3-byte groups so chunk boundaries never introduce padding
+            aligned = len(pending) - len(pending) % 3
+            encoded.append(base64.b64encode(pending[:aligned]))
+            pending = pending[aligned:]
+    encoded.append(base64.b64encode(pending))
+    return b"".join(encoded).decode("ascii")
 
 async def execute_code(
     code: str,
     session_id: Optional[str],
     wait_for_result: bool,
+    depends_on: Optional[str] = None,
 ) -> Any:
     """
     Execute arbitrary Python code in Blender to address tasks.
@@ -210,47 +456,34 @@ async def execute_code(
         code: The Python code to execute.
         session_id: Optional session ID for Blender connection.
         wait_for_result: Whether to wait for job completion.
+        depends_on: Optional job ID the server must finish before running this job.
     Returns:
         Code execution result or job info.
     """
-    api_url = default_api_url
-    data = {"code": code}
-    headers = {"session_id": session_id} if session_id else {}
-    async with httpx.AsyncClient() as client:
-        response = await client.post(f"{api_url}/api/blender/code", json=data, headers=headers)
-        response.raise_for_status()
-        result = response.json()
-    if wait_for_result and "job_id" in result:
-        result = await _wait_for_job_completion(result["job_id"], api_url, session_id)
-    return result if wait_for_result else result
+    return await _call("POST", _CODE_PATH, {"code": code}, session_id, wait_for_result, depends_on)
 
 async def clear_blender_scene(
     session_id: Optional[str],
     wait_for_result: bool,
+    depends_on: Optional[str] = None,
 ) -> Any:
     """
     Clear all objects from the Blender scene.
     Args:
         session_id: Optional session ID for Blender connection.
         wait_for_result: Whether to wait for job completion.
+        depends_on: Optional job ID the server must finish before running this job.
     Returns:
         Scene clear result or job info.
     """
-    api_url = default_api_url
-    headers = {"session_id": session_id} if session_id else {}
-    async with httpx.AsyncClient() as client:
-        response = await client.post(f"{api_url}/api/blender/scene/clear", json={},headers=headers)
-        response.raise_for_status()
-        result = response.json()
-    if wait_for_result and "job_id" in result:
-        result = await _wait_for_job_completion(result["job_id"], api_url, session_id)
-    return result if wait_for_result else result
+    return await _call("POST", _SCENE_CLEAR_PATH, {}, session_id, wait_for_result, depends_on)
 
 async def add_blender_camera(
     location: Optional[List[float]],
     rotation: Optional[List[float]],
     session_id: Optional[str],
     wait_for_result: bool,
+    depends_on: Optional[str] = None,
 ) -> Any:
     """
     Add a camera to the Blender scene.
@@ -259,41 +492,432 @@ async def add_blender_camera(
         rotation: Optional [x, y, z] rotation in radians.
         session_id: Optional session ID for Blender connection.
         wait_for_result: Whether to wait for job completion.
+        depends_on: Optional job ID the server must finish before running this job.
     Returns:
         Camera addition result or job info.
     """
-    api_url = default_api_url
-    data = {}
-    if location:
-        data["location"] = location
-    if rotation:
-        data["rotation"] = rotation
-    headers = {"session_id": session_id} if session_id else {}
-    async with httpx.AsyncClient() as client:
-        response = await client.post(f"{api_url}/api/blender/camera", json=data, headers=headers)
+    return await _call(
+        "POST", _CAMERA_PATH,
+        {"location": location or None, "rotation": rotation or None},
+        session_id, wait_for_result, depends_on,
+    )
+
+async def run_blender_batch(
+    ops: List[Dict[str, Any]],
+    session_id: Optional[str],
+    wait_for_result: bool,
+    depends_on: Optional[str] = None,
+) -> Any:
+    """
+    Run several Blender commands as a single job and a single Blender round trip.
+    Args:
+        ops: Commands as {"type": <command>, "params": {...}}, e.g. {"type": "create_object", "params": {"type": "CUBE"}}.
+        session_id: Optional session ID for Blender connection.
+        wait_for_result: Whether to wait for job completion.
+        depends_on: Optional job ID the server must finish before running this job.
+    Returns:
+        One {"status": ..., "result"/"message": ...} response per op, or job info.
+    """
+    return await _call("POST", _BATCH_PATH, {"ops": ops}, session_id, wait_for_result, depends_on)
+
+async def create_blender_objects_bulk(
+    items: List[Dict[str, Any]],
+    session_id: Optional[str],
+    wait_for_result: bool = True,
+) -> Any:
+    """
+    Create many objects in one batch job.
+    Falls back to concurrent individual requests on servers without the batch endpoint.
+    Args:
+        items: Objects as dicts with "type" and optional "name" and "location" ([x, y, z]).
+        session_id: Optional session ID for Blender connection.
+        wait_for_result: Whether to wait for the objects to be created.
+    Returns:
+        One {"status": "success", "result": ...} response per item, or job info.
+    """
+    ops = [
+        {"type": "create_object", "params": {key: value for key, value in item.items() if value is not None}}
+        for item in items
+    ]
+    try:
+        return await run_blender_batch(ops, session_id, wait_for_result)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code != 404:
+            raise
+    results = await bulk(
+        *(
+            create_blender_object(
+                item["type"], item.get("name"), *(item.get("location") or (None, None, None)),
+                session_id=session_id, wait_for_result=False,
+            )
+            for item in items
+        ),
+        session_id=session_id,
+        wait=wait_for_result,
+    )
+    if not wait_for_result:
+        return results
+    return [{"status": "success", "result": result} for result in results]
+
+async def _call(
+    method: str,
+    path: str,
+    data: Optional[Dict[str, Any]],
+    session_id: Optional[str],
+    wait_for_result: bool,
+    depends_on: Optional[str],
+) -> Any:
+    """
+    Send a request to the API over the shared client and resolve the job it creates.
+    None-valued fields are dropped from the JSON body, so callers pass empty optional
+    values as None to leave them to the server's defaults. When waiting, the server may
+    answer with the finished result instead of a job reference.
+    """
+    if method != "GET":
+        _invalidate_reads()
+    client = get_shared_client(default_api_url, session_id)
+    body = None if data is None else {key: value for key, value in data.items() if value is not None}
+    params = _chain_params(depends_on) or {}
+    if wait_for_result and method == "GET" and not depends_on:
+        # Reads can skip the job queue and return Blender's answer directly
+        params["direct"] = "true"
+    elif wait_for_result:
+        # Let the server hold the response briefly so quick jobs come back without a poll
+        params["wait_ms"] = _SUBMIT_WAIT_MS
+    if body is None:
+        response = await client.request(method, path, params=params)
+    else:
+        response = await client.request(
+            method, path, content=orjson.dumps(body, option=_ORJSON_OPTIONS), headers=_JSON_HEADERS, params=params
+        )
+    response.raise_for_status()
+    if "direct" in params:
+        # Direct reads answer with the command's result, never a job reference
+        return _decode(response)
+    return await _resolve_job(_decode(response), default_api_url, session_id, wait_for_result, depends_on)
+
+def _invalidate_reads() -> None:
+    """Drop cached reads; called before any request that may change the scene."""
+    global _mutation_generation
+    _mutation_generation += 1
+    _RECENT_READS.clear()
+
+async def _single_flight(key: Tuple[Any, ...], fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run fetch() once for all concurrent callers using the same key.
+    Only use this for idempotent reads; later callers join the in-flight request.
+    """
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _INFLIGHT[key] = task
+
+        def _forget(done: "asyncio.Future[Any]") -> None:
+            if _INFLIGHT.get(key) is done:
+                del _INFLIGHT[key]
+
+        task.add_done_callback(_forget)
+    # Shield so one cancelled caller does not cancel the request for the others
+    return await asyncio.shield(task)
+
+def _decode(response: httpx.Response) -> Any:
+    """Parse a JSON response body straight from its bytes."""
+    return orjson.loads(response.content)
+
+def _session_headers(session_id: Optional[str]) -> Dict[str, str]:
+    return {"session_id": session_id} if session_id else {}
+
+def _xyz(
+    x: Optional[float], y: Optional[float], z: Optional[float]
+) -> Optional[Tuple[float, float, float]]:
+    """Pack coordinates into a vector, or None unless all three are given."""
+    return None if None in (x, y, z) else (x, y, z)
+
+def _chain_params(depends_on: Optional[str]) -> Optional[Dict[str, str]]:
+    return {"depends_on": depends_on} if depends_on else None
+
+async def _resolve_job(
+    result: Dict[str, Any],
+    api_url: str,
+    session_id: Optional[str],
+    wait_for_result: bool,
+    depends_on: Optional[str],
+) -> Any:
+    """
+    Wait for a submitted job if requested, otherwise return the job reference.
+    A job the server already finished (see wait_ms) is unwrapped without polling.
+    Chained jobs are returned without polling so callers only await the last job.
+    """
+    if result.get("status") in ("completed", "failed"):
+        return JobResult.from_payload(result).unwrap()
+    if wait_for_result:
+        return await _wait_for_job_completion(result["job_id"], api_url, session_id)
+    if depends_on:
+        result["depends_on"] = depends_on
+    return result
+
+class _EventStreamUnavailable(Exception):
+    """The server does not expose the job event stream"""
+
+async def _wait_for_job_completion(
+    job_id: str,
+    api_url: str,
+    session_id: Optional[str],
+    max_wait_seconds: int = 60,
+    initial_poll_interval: float = 0.05,
+    max_poll_interval: float = 2.0,
+    backoff_factor: float = 1.5,
+) -> Dict[str, Any]:
+    """
+    Wait for a job to finish, preferring the server's event stream and falling
+    back to polling on servers that do not provide one. Concurrent waiters for
+    the same job share a single stream or poll loop.
+    """
+    return await _single_flight(
+        ("job", api_url, job_id),
+        lambda: _follow_job(
+            job_id, api_url, session_id, max_wait_seconds,
+            initial_poll_interval, max_poll_interval, backoff_factor,
+        ),
+    )
+
+async def _follow_job(
+    job_id: str,
+    api_url: str,
+    session_id: Optional[str],
+    max_wait_seconds: int,
+    initial_poll_interval: float,
+    max_poll_interval: float,
+    backoff_factor: float,
+) -> Dict[str, Any]:
+    # Push channels first: a shared WebSocket (if websockets is installed), then a
+    # per-job event stream, then polling
+    pushers = [lambda: _await_job_via_sse(job_id, api_url, session_id)]
+    if websockets is not None:
+        pushers.insert(0, lambda: _subscriber(api_url).wait(job_id))
+    for push in pushers:
+        try:
+            return await asyncio.wait_for(push(), max_wait_seconds)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Job {job_id} did not complete within {max_wait_seconds} seconds")
+        except _EventStreamUnavailable:
+            pass
+    return await _poll_job_completion(
+        job_id, api_url, session_id, max_wait_seconds,
+        initial_poll_interval, max_poll_interval, backoff_factor,
+    )
+
+class _JobSubscriber:
+    """
+    One WebSocket to the job endpoint that resolves completion of any number of
+    jobs. If it cannot connect, or the connection drops, waiters get
+    _EventStreamUnavailable and fall back to the other channels.
+    """
+
+    def __init__(self, api_url: str) -> None:
+        self._url = "ws" + api_url[len("http"):] + _JOBS_WS_PATH if api_url.startswith("http") else api_url
+        # One future per waiter; the job is subscribed once, when its first waiter arrives
+        self._futures: Dict[str, Set["asyncio.Future[JobResult]"]] = {}
+        self._connection: Any = None
+        self._reader: Optional["asyncio.Future[None]"] = None
+        self._lock = asyncio.Lock()
+        self.unavailable = False
+
+    async def wait(self, job_id: str) -> Any:
+        connection = await self._connect()
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._futures.get(job_id)
+        subscribe = waiters is None
+        if subscribe:
+            waiters = self._futures[job_id] = set()
+        waiters.add(future)
+        try:
+            if subscribe:
+                try:
+                    await connection.send(orjson.dumps({"type": "subscribe", "job_id": job_id}).decode())
+                except Exception:
+                    raise _EventStreamUnavailable(job_id)
+            job = await future
+        finally:
+            # Timed out or cancelled waiters must not stay registered
+            waiters.discard(future)
+            if not waiters and self._futures.get(job_id) is waiters:
+                del self._futures[job_id]
+        return job.unwrap()
+
+    async def _connect(self) -> Any:
+        async with self._lock:
+            if self.unavailable:
+                raise _EventStreamUnavailable(self._url)
+            if self._connection is None:
+                try:
+                    self._connection = await websockets.connect(self._url)
+                except Exception:
+                    # Old server or no WebSocket support on the way; stop trying
+                    self.unavailable = True
+                    raise _EventStreamUnavailable(self._url)
+                self._reader = asyncio.ensure_future(self._read(self._connection))
+            return self._connection
+
+    async def _read(self, connection: Any) -> None:
+        try:
+            async for message in connection:
+                payload = orjson.loads(message)
+                for future in self._futures.pop(payload.get("job_id"), ()):
+                    if future.done():
+                        continue
+                    if payload.get("status") == "timeout":
+                        # The server gave up waiting; fall back to the other channels
+                        future.set_exception(_EventStreamUnavailable(self._url))
+                    else:
+                        future.set_result(JobResult.from_payload(payload))
+        except Exception:
+            pass
+        finally:
+            if self._connection is connection:
+                self._connection = None
+            waiters = list(self._futures.values())
+            self._futures.clear()
+            for futures in waiters:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(_EventStreamUnavailable(self._url))
+
+    async def aclose(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+def _subscriber(api_url: str) -> _JobSubscriber:
+    subscribers = _SUBSCRIBERS.setdefault(asyncio.get_running_loop(), {})
+    subscriber = subscribers.get(api_url)
+    if subscriber is None:
+        subscriber = subscribers[api_url] = _JobSubscriber(api_url)
+    return subscriber
+
+async def _await_job_via_sse(job_id: str, api_url: str, session_id: Optional[str]) -> Dict[str, Any]:
+    """
+    Follow a job's server-sent events until it completes or fails.
+    Raises _EventStreamUnavailable if the server has no events endpoint.
+    """
+    client = get_shared_client(api_url, session_id)
+    # Ask for an uncompressed stream so a gzip layer cannot hold events back
+    async with client.stream("GET", f"{_JOBS_PATH}/{job_id}/events", timeout=_STREAM_TIMEOUT,
+                             headers={"Accept-Encoding": "identity"}) as response:
+        if response.status_code in (404, 405):
+            raise _EventStreamUnavailable(job_id)
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            job = JobResult.from_payload(orjson.loads(line[len("data:"):]))
+            if job.finished:
+                return job.unwrap()
+    raise _EventStreamUnavailable(job_id)
+
+async def _poll_job_completion(
+    job_id: str,
+    api_url: str,
+    session_id: Optional[str],
+    max_wait_seconds: int,
+    initial_poll_interval: float,
+    max_poll_interval: float,
+    backoff_factor: float,
+) -> Dict[str, Any]:
+    """
+    Poll a job until it completes, backing off exponentially (with jitter) between polls.
+    The poll interval resets whenever the job's status changes.
+    """
+    start_time = time.monotonic()
+    client = get_shared_client(api_url, session_id)
+    delay = initial_poll_interval
+    last_status = None
+    while True:
+        # Check status first so a finished job returns without sleeping or a deadline check
+        response = await client.get(f"{_JOBS_PATH}/{job_id}")
         response.raise_for_status()
-        result = response.json()
-    if wait_for_result and "job_id" in result:
-        result = await _wait_for_job_completion(result["job_id"], api_url, session_id)
-    return result if wait_for_result else result
-
-async def _wait_for_job_completion(job_id: str, api_url: str, session_id: Optional[str], max_wait_seconds: int = 60, poll_interval_seconds: float = 0.5) -> Dict[str, Any]:
-    import asyncio, time
-    headers = {"session_id": session_id} if session_id else {}
-    start_time = time.time()
-    async with httpx.AsyncClient() as client:
-        while True:
-            elapsed = time.time() - start_time
-            if elapsed > max_wait_seconds:
-                raise TimeoutError(f"Job {job_id} did not complete within {max_wait_seconds} seconds")
-            response = await client.get(f"{api_url}/api/jobs/{job_id}", headers=headers)
-            response.raise_for_status()
-            job_info = response.json()
-            if job_info["status"] == "completed":
-                return job_info["result"]
-            elif job_info["status"] == "failed":
-                raise Exception(f"Job failed: {job_info.get('error', 'Unknown error')}")
-            await asyncio.sleep(poll_interval_seconds)
+        job = JobResult.from_payload(_decode(response))
+        if job.finished:
+            return job.unwrap()
+        if time.monotonic() - start_time > max_wait_seconds:
+            raise TimeoutError(f"Job {job_id} did not complete within {max_wait_seconds} seconds")
+        if job.status != last_status:
+            last_status = job.status
+            delay = initial_poll_interval
+        await asyncio.sleep(delay + random.uniform(0, delay * 0.1))
+        delay = min(delay * backoff_factor, max_poll_interval)
+
+async def bulk(
+    *submissions: Awaitable[Any],
+    session_id: Optional[str] = None,
+    wait: bool = True,
+    grace_after_first: Optional[float] = None,
+) -> Any:
+    """
+    Submit several tool calls at once and await their jobs together.
+    Pass tool coroutines created with wait_for_result=False; all requests are
+    sent concurrently over the shared client and the resulting jobs are
+    awaited in parallel, so latency tracks the slowest job rather than the sum.
+
+    Usage:
+        results = await bulk(
+            create_blender_object("CUBE", None, 0, 0, 0, session_id, False),
+            create_blender_object("SPHERE", None, 2, 0, 0, session_id, False),
+            session_id=session_id,
+        )
+
+    Args:
+        submissions: Tool call coroutines, each returning a job reference or a result.
+        session_id: Optional session ID used while waiting for the jobs.
+        wait: Whether to wait for the submitted jobs to complete.
+        grace_after_first: Optional seconds to keep waiting once the first job finishes.
+            Jobs still running after that are left running and reported as pending.
+    Returns:
+        One entry per submission, in order: the job result, or the job reference if wait is False.
+        If the grace period runs out, a dict with "status": "partial", the finished
+        results under "completed" and the unfinished job IDs under "pending".
+    """
+    submitted = await asyncio.gather(*submissions)
+    if not wait:
+        return list(submitted)
+
+    async def settle(result: Any) -> Any:
+        if isinstance(result, dict) and "job_id" in result:
+            return await _wait_for_job_completion(result["job_id"], default_api_url, session_id)
+        return result
+
+    if grace_after_first is None:
+        return list(await asyncio.gather(*(settle(result) for result in submitted)))
+
+    waits = [asyncio.ensure_future(settle(result)) for result in submitted]
+    await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+    _, pending = await asyncio.wait(waits, timeout=grace_after_first)
+    if not pending:
+        return [task.result() for task in waits]
+    for task in pending:
+        # Only this caller's wait is cancelled; the job itself keeps running server-side
+        task.cancel()
+    return {
+        "status": "partial",
+        "completed": [task.result() for task in waits if task not in pending],
+        "pending": [result["job_id"] for result, task in zip(submitted, waits) if task in pending],
+    }
+
+async def run_parallel(calls: List[Awaitable[Any]]) -> List[Any]:
+    """
+    Await independent tool calls concurrently over the shared connection pool.
+    Exceptions are returned in place of results so one failure does not hide the others.
+
+    Usage:
+        results = await run_parallel([delete_blender_object(n, session_id, True) for n in names])
+
+    Args:
+        calls: Tool call coroutines that do not depend on each other.
+    Returns:
+        One result or exception per call, in order.
+    """
+    return list(await asyncio.gather(*calls, return_exceptions=True))
 
 # List of all tool callables for agent registration
 blender_tools = [
@@ -309,4 +933,27 @@ blender_tools = [
 ]
 
 async def get_blender_tools() -> List[Callable]:
-    return blender_tools
\ No newline at end of file
+    return blender_tools
+
+class BlenderTools:
+    """
+    Async context manager that provides the agent tools and closes their pooled
+    HTTP connections on exit.
+
+    Usage:
+        async with BlenderTools() as blender:
+            agent = OpenAIAgent(tools=blender.tools)
+            ...
+    """
+
+    def __init__(self) -> None:
+        self.tools: List[Callable] = list(blender_tools)
+
+    async def __aenter__(self) -> "BlenderTools":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await aclose_shared_clients()
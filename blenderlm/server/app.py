@@ -1,25 +1,40 @@
 import asyncio
+import atexit
 import os
 import logging
+import logging.handlers
+import queue
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
+from ..client.tools import aclose_shared_clients
 from .database import BlenderLMDatabase
 from .connection import BlenderConnectionManager
+from .events import JobNotifier
+from .writer import JobWriter
 from .models import *
 
 
 from .routes import blender, jobs, projects, misc
 from .routes import ws  # Import the new WebSocket router
 
+# Log records are formatted by the QueueHandler and written by a listener thread, so
+# console and file I/O never block the event loop. The log file rotates at 50 MB.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue,
+    logging.StreamHandler(),
+    logging.handlers.RotatingFileHandler("blenderlm_api.log", maxBytes=50_000_000, backupCount=5),
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("blenderlm_api.log")
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger("blenderlm.api")
 
@@ -27,6 +42,12 @@ logger = logging.getLogger("blenderlm.api")
 async def lifespan(app: FastAPI):
     """Lifecycle manager for the FastAPI app"""
     logger.info("Starting BlenderLM API server")
+
+    # Eager tasks run synchronously until their first real suspension, saving a loop
+    # iteration for the many short coroutines per request (Python 3.12+, opt-in)
+    if os.environ.get("BLENDERLM_EAGER_TASKS") == "1" and hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        logger.info("Using eager task factory")
     
     db_path = os.environ.get("BLENDERLM_DB_PATH", "blenderlm.db")
     app.state.database = BlenderLMDatabase(db_path)
@@ -34,17 +55,29 @@ async def lifespan(app: FastAPI):
     
     blender_host = os.environ.get("BLENDERLM_BLENDER_HOST", "localhost")
     blender_port = int(os.environ.get("BLENDERLM_BLENDER_PORT", "9876"))
-    app.state.blender_manager = BlenderConnectionManager(host=blender_host, port=blender_port)
+    batch_window_ms = float(os.environ.get("BLENDERLM_BATCH_WINDOW_MS", "0"))
+    app.state.blender_manager = BlenderConnectionManager(
+        host=blender_host, port=blender_port, batch_window_ms=batch_window_ms
+    )
     logger.info(f"Initialized connection manager for Blender at {blender_host}:{blender_port}")
+    app.state.job_notifier = JobNotifier()
+    app.state.job_writer = JobWriter(app.state.database)
+    app.state.job_writer.start()
     
+    cleanup_interval = float(os.environ.get("BLENDERLM_CLEANUP_INTERVAL_SECONDS", "3600"))
+
     async def cleanup_task():
         while True:
             try:
-                result = app.state.database.clean_old_jobs(max_age_hours=24)
+                # SQLite calls block, so keep the delete off the event loop
+                result = await asyncio.to_thread(app.state.database.clean_old_jobs, max_age_hours=24)
                 logger.debug(f"Cleaned up old jobs: {result}")
+                # Keep the WAL file from growing across long uptimes
+                await asyncio.to_thread(app.state.database.checkpoint)
+                await asyncio.to_thread(app.state.database.optimize)
             except Exception as e:
                 logger.error(f"Error in cleanup task: {e}")
-            await asyncio.sleep(3600)
+            await asyncio.sleep(cleanup_interval)
             
     cleanup_task_handle = asyncio.create_task(cleanup_task())
     logger.info("Started background cleanup task")
@@ -53,22 +86,46 @@ async def lifespan(app: FastAPI):
         yield
     finally:
         cleanup_task_handle.cancel()
+        await app.state.job_writer.close()
+        await app.state.blender_manager.close()
+        await aclose_shared_clients()
+        app.state.database.close()
         logger.info("Shutting down BlenderLM API server")
 
+class _GZipExceptEventStreams(GZipMiddleware):
+    """
+    GZip that leaves the job event streams alone. Starlette releases older than the
+    ones that skip text/event-stream buffer compressed events until the stream ends.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/events"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
 app = FastAPI(
     title="BlenderLM API",
     description="API for controlling Blender with LLM agents",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Comma-separated list of allowed browser origins; restrict it in deployments so
+# preflight responses can be cached per origin
+cors_origins = [origin.strip() for origin in os.environ.get("BLENDERLM_CORS_ORIGINS", "*").split(",")]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Scene info and job listings compress well; a mid compression level keeps the CPU
+# cost reasonable on large base64 image payloads
+app.add_middleware(_GZipExceptEventStreams, minimum_size=1024, compresslevel=5)
 
 # Register routers
 app.include_router(blender.router)
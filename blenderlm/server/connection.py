@@ -1,7 +1,9 @@
 import asyncio
 import json
 import logging
+import orjson
 import socket
+import struct
 import time
 import uuid
 from dataclasses import dataclass
@@ -9,6 +11,16 @@ from typing import Any, Dict, Optional
 
 logger = logging.getLogger("blenderlm.connection")
 
+class StaleConnectionError(ConnectionError):
+    """The socket was dead before Blender received the command, so it is safe to resend"""
+
+def _loads(data: bytes) -> Any:
+    """Decode a Blender response, falling back to json for NaN/Infinity literals orjson rejects"""
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
+
 @dataclass
 class BlenderConnection:
     """
@@ -19,6 +31,8 @@ class BlenderConnection:
     session_id: str | None = None
     sock: socket.socket  | None = None
     last_activity: float  | None = None
+    # Set when the addon agreed to length-prefix its responses on this socket
+    framed: bool = False
     
     def __post_init__(self):
         if self.session_id is None:
@@ -35,12 +49,62 @@ class BlenderConnection:
             self.sock.connect((self.host, self.port))
             logger.info(f"Connected to Blender at {self.host}:{self.port} (session: {self.session_id})")
             self.last_activity = time.time()
+            self.framed = False
+            self._negotiate_framing()
             return True
         except Exception as e:
             logger.error(f"Failed to connect to Blender: {str(e)}")
             self.sock = None
             return False
     
+    def _negotiate_framing(self):
+        """
+        Ask the addon for length-prefixed responses. Older addons reply with an
+        unknown-command error, and the connection keeps parse-to-detect framing.
+        """
+        try:
+            self.sock.sendall(orjson.dumps({"type": "set_framing", "params": {"enabled": True}}))
+            response = _loads(self.receive_full_response(timeout=10.0))
+            self.framed = response.get("status") == "success"
+        except Exception as e:
+            logger.warning(f"Could not negotiate framing with Blender: {e}")
+            self.framed = False
+        logger.debug(f"Blender responses are {'length-prefixed' if self.framed else 'unframed'}")
+
+    def _receive_exactly(self, n: int) -> bytearray:
+        """Read exactly n bytes into a preallocated buffer"""
+        buf = bytearray(n)
+        view = memoryview(buf)
+        received = 0
+        while received < n:
+            count = self.sock.recv_into(view[received:])
+            if not count:
+                raise ConnectionError("Connection closed mid-message")
+            received += count
+        return buf
+
+    def is_alive(self) -> bool:
+        """
+        Check the socket without sending anything: a non-blocking peek raises
+        BlockingIOError on a live, idle connection. An EOF or reset means Blender
+        closed it, and unread bytes mean an earlier response was abandoned and
+        the stream is out of step, so both count as dead.
+        """
+        if self.sock is None:
+            return False
+        timeout = self.sock.gettimeout()
+        try:
+            self.sock.setblocking(False)
+            try:
+                self.sock.recv(1, socket.MSG_PEEK)
+            finally:
+                self.sock.settimeout(timeout)
+            return False
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+
     def disconnect(self):
         """Disconnect from the Blender addon"""
         if self.sock:
@@ -51,39 +115,17 @@ class BlenderConnection:
             finally:
                 self.sock = None
     
-    def is_connected(self) -> bool:
-        """Check if the connection is still active"""
-        if not self.sock:
-            return False
-            
-        try:
-            # Try to send an empty message as a keepalive
-            self.sock.settimeout(1.0)
-            # Use a ping command instead of empty data
-            ping_cmd = json.dumps({"type": "ping"}).encode('utf-8')
-            self.sock.sendall(ping_cmd)
-            
-            # Wait for response
-            try:
-                data = self.sock.recv(1024)
-                if data:
-                    # Update last activity timestamp
-                    self.last_activity = time.time()
-                    return True
-                return False
-            except socket.timeout:
-                return False
-                
-        except Exception:
-            self.sock = None
-            return False
-    
     def receive_full_response(self, buffer_size=32768, timeout=120.0):  
         """Receive the complete response, potentially in multiple chunks"""
         chunks = []
         if self.sock is None: 
             raise ConnectionError("Not connected to Blender")
         self.sock.settimeout(timeout)  # Use a much longer timeout for large responses
+        if self.framed:
+            # Read the 4-byte length, then exactly that many bytes; parsed once by the caller
+            header = self._receive_exactly(4)
+            (length,) = struct.unpack('>I', header)
+            return bytes(self._receive_exactly(length))
         
         start_time = time.time()  # Ensure start_time is always defined
         data_buffer = b''  # Ensure data_buffer is always defined
@@ -240,7 +282,17 @@ class BlenderConnection:
                 self.connect()
                 if self.sock is None:  # If connect failed, sock will still be None
                     raise ConnectionError("Failed to connect to Blender")
-            self.sock.sendall(json.dumps(command).encode('utf-8'))
+            elif not self.is_alive():
+                # Blender closed the socket while it sat idle (e.g. it was restarted);
+                # nothing has been sent yet, so reconnect before sending
+                logger.info("Blender connection was closed, reconnecting")
+                self.disconnect()
+                if not self.connect():
+                    raise ConnectionError("Failed to reconnect to Blender")
+            try:
+                self.sock.sendall(orjson.dumps(command))
+            except (BrokenPipeError, ConnectionResetError) as e:
+                raise StaleConnectionError(f"Send failed: {e}") from e
             logger.debug(f"Command sent, waiting for response...")
             
             # Update last activity timestamp
@@ -248,7 +300,7 @@ class BlenderConnection:
             
             # Receive the response
             response_data = self.receive_full_response()
-            response = json.loads(response_data.decode('utf-8'))
+            response = _loads(response_data)
             
             if response.get("status") == "error":
                 logger.error(f"Blender error: {response.get('message')}")
@@ -259,6 +311,9 @@ class BlenderConnection:
             logger.error("Socket timeout while waiting for response from Blender")
             self.sock = None
             raise Exception("Timeout waiting for Blender response")
+        except StaleConnectionError:
+            self.disconnect()
+            raise
         except (ConnectionError, BrokenPipeError) as e:
             logger.error(f"Socket connection error: {str(e)}")
             self.sock = None
@@ -275,43 +330,159 @@ class BlenderConnectionManager:
     """
     Manages a single connection to Blender from within FastAPI
     """
-    def __init__(self, host="localhost", port=9876):
+    # Commands whose responses can carry large images are always sent on their own
+    UNBATCHED_COMMANDS = {"capture_viewport", "render_scene"}
+
+    def __init__(self, host="localhost", port=9876, batch_window_ms: float = 0, max_batch: int = 32):
         self.host = host
         self.port = port
         self.connection = BlenderConnection(host=host, port=port)
         self.connection_lock = asyncio.Lock()
         self.is_connected = False
+        # With a batch window, commands arriving within it are sent to Blender as one
+        # "batch" command and their responses are split back out
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch = max_batch
+        self._pending: Optional[asyncio.Queue] = None
+        self._submitter: Optional[asyncio.Task] = None
         
     async def ensure_connected(self):
         """Ensure we have a connection to Blender"""
+        # Connected is the common case; answer it without queueing behind a running command
+        if self.is_connected:
+            return True
         async with self.connection_lock:
-            if not self.is_connected:
-                try:
-                    logger.info(f"Connecting to Blender at {self.host}:{self.port}")
-                    if self.connection.connect():
-                        self.is_connected = True
-                        logger.info("Connected to Blender successfully")
-                    else:
-                        logger.error("Failed to connect to Blender")
-                except Exception as e:
-                    logger.error(f"Error connecting to Blender: {e}")
-                    self.is_connected = False
-            
-            return self.is_connected
+            return await self._connect()
+
+    async def check_connection(self) -> bool:
+        """
+        Report whether Blender is reachable. An idle socket is peeked to catch a Blender
+        that went away since the last command; a command in progress shows the socket is
+        in use, so the check does not wait behind it.
+        """
+        if self.is_connected and self.connection_lock.locked():
+            return True
+        async with self.connection_lock:
+            if self.is_connected and not self.connection.is_alive():
+                logger.info("Blender connection was closed")
+                self.connection.disconnect()
+                self.is_connected = False
+            return await self._connect()
+
+    async def _connect(self) -> bool:
+        """Connect if needed; the caller must hold connection_lock"""
+        if not self.is_connected:
+            try:
+                logger.info(f"Connecting to Blender at {self.host}:{self.port}")
+                if await asyncio.to_thread(self.connection.connect):
+                    self.is_connected = True
+                    logger.info("Connected to Blender successfully")
+                else:
+                    logger.error("Failed to connect to Blender")
+            except Exception as e:
+                logger.error(f"Error connecting to Blender: {e}")
+                self.is_connected = False
+        return self.is_connected
                 
     async def send_command(self, command_type: str, params: Optional[Dict[str, Any]] = None):
-        """Send a command to Blender"""
+        """Send a command to Blender, batching it with others if a batch window is set"""
+        if self.batch_window <= 0 or command_type in self.UNBATCHED_COMMANDS:
+            return await self._send(command_type, params)
+        if self._submitter is None or self._submitter.done():
+            self._pending = asyncio.Queue()
+            self._submitter = asyncio.create_task(self._submit_batches(self._pending))
+        future = asyncio.get_running_loop().create_future()
+        self._pending.put_nowait((command_type, params, future))
+        return await future
+
+    async def _submit_batches(self, pending: asyncio.Queue):
+        """Drain queued commands once per batch window and send them together"""
+        ops = []
+        try:
+            while True:
+                ops = [await pending.get()]
+                await asyncio.sleep(self.batch_window)
+                while len(ops) < self.max_batch and not pending.empty():
+                    ops.append(pending.get_nowait())
+                await self._send_batch(ops)
+        finally:
+            # Stopped by close(): fail whatever was in flight or still waiting for a window
+            error = ConnectionError("Blender connection manager was closed")
+            while not pending.empty():
+                ops.append(pending.get_nowait())
+            for _, _, future in ops:
+                if not future.done():
+                    future.set_exception(error)
+
+    async def _send_batch(self, ops: list):
+        """Send queued commands, as one "batch" command if there are several, and resolve their futures"""
+        if len(ops) == 1:
+            command_type, params, future = ops[0]
+            try:
+                result = await self._send(command_type, params)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            return
+        logger.debug(f"Sending {len(ops)} commands to Blender as one batch")
+        try:
+            responses = await self._send(
+                "batch", {"ops": [{"type": command_type, "params": params or {}} for command_type, params, _ in ops]}
+            )
+            if not isinstance(responses, list) or len(responses) != len(ops):
+                raise Exception("Invalid batch response from Blender")
+        except Exception as e:
+            for _, _, future in ops:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, _, future), response in zip(ops, responses):
+            if future.done():
+                continue
+            if response.get("status") == "error":
+                future.set_exception(Exception(response.get("message", "Unknown error from Blender")))
+            else:
+                future.set_result(response.get("result", {}))
+
+    async def close(self):
+        """Stop the batch submitter, if running, failing any commands it still holds"""
+        if self._submitter is not None:
+            self._submitter.cancel()
+            try:
+                await self._submitter
+            except asyncio.CancelledError:
+                pass
+            self._submitter = None
+
+    async def _send(self, command_type: str, params: Optional[Dict[str, Any]] = None):
+        """Send a single command to Blender over the shared connection"""
         async with self.connection_lock:
-            # Make sure we're connected
-            if not self.is_connected:
-                if not await self.ensure_connected():
-                    raise ConnectionError("Could not connect to Blender")
+            # Make sure we're connected; the lock is already held, so connect directly
+            if not await self._connect():
+                raise ConnectionError("Could not connect to Blender")
             
-            # Send the command
+            # Send the command; the socket calls block, so run them in a worker thread
+            # and let other requests proceed while Blender works
             try:
-                return self.connection.send_command(command_type, params)
+                return await asyncio.to_thread(self.connection.send_command, command_type, params)
+            except StaleConnectionError:
+                # Only raised when the send itself failed, so Blender never saw the command;
+                # reconnect once and resend. A failure after the send may mean the command
+                # already ran, so it is never retried
+                logger.info("Blender connection was stale, reconnecting")
+                self.is_connected = False
             except Exception as e:
                 # Mark as disconnected if there was an error
                 self.is_connected = False
                 raise e
+            if not await self._connect():
+                raise ConnectionError("Could not connect to Blender")
+            try:
+                return await asyncio.to_thread(self.connection.send_command, command_type, params)
+            except Exception:
+                self.is_connected = False
+                raise
 
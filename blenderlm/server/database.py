@@ -1,12 +1,15 @@
 import sqlite3
 import json
 import os
+import queue
+import threading
 import time
 import uuid
 from contextlib import contextmanager
 from enum import Enum
 from typing import Dict, Any, Optional, List, Union
 from datetime import datetime
+from urllib.request import pathname2url
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,13 +30,26 @@ class BlenderLMDatabase:
     Replaces SQLiteJobQueue with extended functionality for project management.
     """
     
-    def __init__(self, db_path="blenderlm.db"):
+    def __init__(self, db_path="blenderlm.db", max_readers=None):
         self.db_path = db_path
+        # Reads run in worker threads, so keep roughly one idle reader per core
+        self.max_readers = max_readers or os.cpu_count() or 4
+        # One long-lived writer shared under a lock, plus a small pool of read-only
+        # connections that WAL lets run alongside it
+        self._writer = self._connect(db_path, isolation_level="IMMEDIATE")
+        self._write_lock = threading.Lock()
+        self._readers: "queue.SimpleQueue[sqlite3.Connection]" = queue.SimpleQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
         self._init_db()
         
     def _init_db(self):
         """Initialize database with both job and project tables"""
         with self._get_conn() as conn:
+            # WAL lets readers proceed alongside the writer; the setting persists in the file
+            if self.db_path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+
             # Create projects table
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS projects (
@@ -76,18 +92,86 @@ class BlenderLMDatabase:
             
             # Create indexes for better performance
             conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_project_id ON jobs (project_id)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)')
+            # Serves both status lookups and the age filter in clean_old_jobs
+            conn.execute('DROP INDEX IF EXISTS idx_jobs_status')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status_completed ON jobs (status, completed_at)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_projects_status ON projects (status)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_projects_updated_at ON projects (updated_at)')
             
+    @staticmethod
+    def _connect(database, uri=False, isolation_level=""):
+        # The statement cache covers every fixed query plus update_project's column combinations
+        conn = sqlite3.connect(
+            database, timeout=30.0, uri=uri, isolation_level=isolation_level, check_same_thread=False,
+            cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        # Under WAL, NORMAL sync is still crash-safe and avoids an fsync per commit
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # Connections are pooled, so a larger page cache survives between calls
+        conn.execute("PRAGMA cache_size=-20000")
+        return conn
+
     @contextmanager
     def _get_conn(self):
-        conn = sqlite3.connect(self.db_path, timeout=30.0)
-        conn.row_factory = sqlite3.Row
+        """Borrow the writer connection; implicit transactions begin IMMEDIATE"""
+        with self._write_lock:
+            try:
+                yield self._writer
+            finally:
+                # Never hand an uncommitted transaction to the next caller
+                if self._writer.in_transaction:
+                    self._writer.rollback()
+
+    @contextmanager
+    def _read_conn(self):
+        """Borrow a read-only connection from the pool, opening one if none is idle"""
+        if self.db_path == ":memory:":
+            # A private in-memory database is only visible through the writer
+            with self._get_conn() as conn:
+                yield conn
+            return
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            uri = f"file:{pathname2url(os.path.abspath(self.db_path))}?mode=ro"
+            conn = self._connect(uri, uri=True)
+            with self._reader_lock:
+                self._reader_count += 1
         try:
             yield conn
         finally:
-            conn.close()
+            with self._reader_lock:
+                keep = self._reader_count <= self.max_readers
+                if not keep:
+                    self._reader_count -= 1
+            if keep:
+                self._readers.put(conn)
+            else:
+                conn.close()
+
+    def checkpoint(self):
+        """Fold the WAL back into the database file and truncate it"""
+        if self.db_path == ":memory:":
+            return
+        with self._get_conn() as conn:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def optimize(self):
+        """Let SQLite refresh query planner statistics where they have drifted"""
+        with self._get_conn() as conn:
+            conn.execute("PRAGMA optimize")
+
+    def close(self):
+        """Close the writer and any idle reader connections"""
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._write_lock:
+            self._writer.close()
 
     # =============================================================================
     # PROJECT MANAGEMENT METHODS
@@ -96,33 +180,51 @@ class BlenderLMDatabase:
     def create_project(self, name: str, description: str = "", file_path: str = "", 
                       metadata: Optional[Dict[str, Any]] = None) -> str:
         """Create a new project and return its ID"""
-        project_id = str(uuid.uuid4())
-        current_time = time.time()
-        
         with self._get_conn() as conn:
-            conn.execute(
-                """INSERT INTO projects 
-                   (id, name, description, file_path, status, created_at, updated_at, metadata)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    project_id, 
-                    name, 
-                    description, 
-                    file_path,
-                    ProjectStatus.ACTIVE.value,
-                    current_time,
-                    current_time,
-                    json.dumps(metadata or {})
-                )
-            )
+            project_id = self._insert_project(conn, name, description, file_path, metadata)
             conn.commit()
         
         logger.info(f"Created project: {name} ({project_id})")
         return project_id
+
+    def create_project_with_job(self, name: str, command_type: str, params: Optional[Dict[str, Any]] = None,
+                                description: str = "", file_path: str = "",
+                                metadata: Optional[Dict[str, Any]] = None) -> tuple:
+        """
+        Create a project and queue its first job in a single transaction.
+        Returns (project_id, job_id).
+        """
+        with self._get_conn() as conn:
+            project_id = self._insert_project(conn, name, description, file_path, metadata)
+            job_id = self._insert_jobs(conn, [(command_type, params, project_id)])[0]
+            conn.commit()
+
+        logger.info(f"Created project: {name} ({project_id})")
+        return project_id, job_id
+
+    def _insert_project(self, conn, name, description, file_path, metadata) -> str:
+        project_id = str(uuid.uuid4())
+        current_time = time.time()
+        conn.execute(
+            """INSERT INTO projects 
+               (id, name, description, file_path, status, created_at, updated_at, metadata)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                project_id, 
+                name, 
+                description, 
+                file_path,
+                ProjectStatus.ACTIVE.value,
+                current_time,
+                current_time,
+                json.dumps(metadata or {})
+            )
+        )
+        return project_id
     
     def get_project(self, project_id: str) -> Optional[Dict[str, Any]]:
         """Get a project by ID"""
-        with self._get_conn() as conn:
+        with self._read_conn() as conn:
             cursor = conn.execute("SELECT * FROM projects WHERE id = ?", (project_id,))
             row = cursor.fetchone()
             
@@ -136,7 +238,7 @@ class BlenderLMDatabase:
     
     def get_project_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """Get a project by name"""
-        with self._get_conn() as conn:
+        with self._read_conn() as conn:
             cursor = conn.execute("SELECT * FROM projects WHERE name = ?", (name,))
             row = cursor.fetchone()
             
@@ -150,7 +252,7 @@ class BlenderLMDatabase:
     
     def list_projects(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
         """List projects, optionally filtered by status"""
-        with self._get_conn() as conn:
+        with self._read_conn() as conn:
             if status:
                 cursor = conn.execute(
                     "SELECT * FROM projects WHERE status = ? ORDER BY updated_at DESC LIMIT ?",
@@ -242,26 +344,32 @@ class BlenderLMDatabase:
     def add_job(self, command_type: str, params: Optional[Dict[str, Any]] = None, 
                 project_id: Optional[str] = None) -> str:
         """Add a job to the queue, optionally associated with a project"""
-        job_id = str(uuid.uuid4())
+        return self.add_jobs([(command_type, params, project_id)])[0]
+
+    def add_jobs(self, jobs: List[tuple]) -> List[str]:
+        """
+        Add several (command_type, params, project_id) jobs in one transaction.
+        Returns the new job IDs in the same order.
+        """
         try:
             with self._get_conn() as conn:
-                conn.execute(
-                    "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, NULL, NULL, ?, NULL)",
-                    (
-                        job_id, 
-                        project_id,
-                        command_type, 
-                        json.dumps(params or {}),
-                        JobStatus.PENDING.value,
-                        time.time()
-                    )
-                )
-                conn.execute("INSERT INTO queue (job_id) VALUES (?)", (job_id,))
+                job_ids = self._insert_jobs(conn, jobs)
                 conn.commit()
-            return job_id
+            return job_ids
         except Exception as e:
             logger.error(f"Error adding job: {str(e)}")
             raise e
+
+    def _insert_jobs(self, conn, jobs: List[tuple]) -> List[str]:
+        now = time.time()
+        rows = [
+            (str(uuid.uuid4()), project_id, command_type, json.dumps(params or {}), JobStatus.PENDING.value, now)
+            for command_type, params, project_id in jobs
+        ]
+        job_ids = [row[0] for row in rows]
+        conn.executemany("INSERT INTO jobs VALUES (?, ?, ?, ?, ?, NULL, NULL, ?, NULL)", rows)
+        conn.executemany("INSERT INTO queue (job_id) VALUES (?)", [(job_id,) for job_id in job_ids])
+        return job_ids
         
     def get_next_job(self) -> Optional[Dict[str, Any]]:
         """Get the next job from the queue"""
@@ -301,19 +409,29 @@ class BlenderLMDatabase:
     
     def update_job(self, job_id: str, status: Union[JobStatus, str], result=None, error=None):
         """Update job status and result"""
-        if isinstance(status, str):
-            status = JobStatus(status)
-            
+        self.write_jobs([], [(job_id, status, result, error)])
+
+    def write_jobs(self, jobs: List[tuple], updates: List[tuple]) -> List[str]:
+        """
+        Add (command_type, params, project_id) jobs and apply (job_id, status, result, error)
+        updates, in order, in one transaction. Returns the new job IDs.
+        """
+        now = time.time()
+        rows = [
+            (JobStatus(status).value, json.dumps(result) if result else None, error, now, job_id)
+            for job_id, status, result, error in updates
+        ]
         with self._get_conn() as conn:
-            conn.execute(
-                "UPDATE jobs SET status = ?, result = ?, error = ?, completed_at = ? WHERE id = ?",
-                (status.value, json.dumps(result) if result else None, error, time.time(), job_id)
+            job_ids = self._insert_jobs(conn, jobs) if jobs else []
+            conn.executemany(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, completed_at = ? WHERE id = ?", rows
             )
             conn.commit()
+        return job_ids
     
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get a job by ID"""
-        with self._get_conn() as conn:
+        with self._read_conn() as conn:
             cursor = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
             row = cursor.fetchone()
             
@@ -329,7 +447,7 @@ class BlenderLMDatabase:
     
     def list_pending_jobs(self) -> List[Dict[str, Any]]:
         """List all pending jobs in queue"""
-        with self._get_conn() as conn:
+        with self._read_conn() as conn:
             cursor = conn.execute(
                 "SELECT jobs.* FROM jobs JOIN queue ON jobs.id = queue.job_id ORDER BY jobs.created_at DESC"
             )
@@ -345,7 +463,7 @@ class BlenderLMDatabase:
     
     def list_project_jobs(self, project_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """List jobs for a specific project"""
-        with self._get_conn() as conn:
+        with self._read_conn() as conn:
             cursor = conn.execute(
                 "SELECT * FROM jobs WHERE project_id = ? ORDER BY created_at DESC LIMIT ?",
                 (project_id, limit)
@@ -360,14 +478,26 @@ class BlenderLMDatabase:
                 jobs.append(job)
             return jobs
 
-    def clean_old_jobs(self, max_age_hours=24):
-        """Remove completed/failed jobs older than the specified age"""
+    def clean_old_jobs(self, max_age_hours=24, batch_size=1000):
+        """
+        Remove completed/failed jobs older than the specified age.
+        Deletes in batches and takes the write lock once per batch, so other writes can
+        run between batches. Returns the number of jobs removed.
+        """
         cutoff_time = time.time() - (max_age_hours * 3600)
-        with self._get_conn() as conn:
-            conn.execute(
-                "DELETE FROM jobs WHERE status IN (?, ?) AND completed_at < ?",
-                (JobStatus.COMPLETED.value, JobStatus.FAILED.value, cutoff_time)
-            )
-            conn.commit()
+        removed = 0
+        while True:
+            with self._get_conn() as conn:
+                job_ids = [(row[0],) for row in conn.execute(
+                    "SELECT id FROM jobs WHERE status IN (?, ?) AND completed_at < ? LIMIT ?",
+                    (JobStatus.COMPLETED.value, JobStatus.FAILED.value, cutoff_time, batch_size)
+                )]
+                # Queue rows are never consumed for jobs run by the API, so drop them with their jobs
+                conn.executemany("DELETE FROM queue WHERE job_id = ?", job_ids)
+                conn.executemany("DELETE FROM jobs WHERE id = ?", job_ids)
+                conn.commit()
+            removed += len(job_ids)
+            if len(job_ids) < batch_size:
+                return removed
 
 
@@ -0,0 +1,37 @@
+import asyncio
+from contextlib import contextmanager
+from typing import Dict, Iterator, Set
+
+
+class JobNotifier:
+    """
+    In-process notification of job completion, keyed by job ID.
+    Lets handlers await a job finishing instead of polling the database.
+    """
+
+    def __init__(self):
+        self._waiters: Dict[str, Set[asyncio.Future]] = {}
+
+    @contextmanager
+    def subscribe(self, job_id: str) -> Iterator[asyncio.Future]:
+        """
+        Register interest in a job and yield a future resolved when it finishes.
+        Subscribe before reading the job's current status so a completion in
+        between cannot be missed.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(job_id, set()).add(future)
+        try:
+            yield future
+        finally:
+            waiters = self._waiters.get(job_id)
+            if waiters is not None:
+                waiters.discard(future)
+                if not waiters:
+                    del self._waiters[job_id]
+
+    def notify(self, job_id: str) -> None:
+        """Wake everything waiting on the given job"""
+        for future in self._waiters.pop(job_id, set()):
+            if not future.done():
+                future.set_result(None)
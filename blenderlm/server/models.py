@@ -83,7 +83,8 @@ class JobInfo(BaseModel):
     command_type: str
     params: Dict[str, Any]
     status: JobStatus
-    result: Optional[Dict[str, Any]] = None
+    # Batch jobs complete with one response per op
+    result: Optional[Union[Dict[str, Any], List[Any]]] = None
     error: Optional[str] = None
     created_at: float
     completed_at: Optional[float] = None
@@ -202,6 +203,20 @@ class CodeRequest(BaseModel):
     code: str
 
 
+class BatchOperation(BaseModel):
+    """A single Blender command within a batch"""
+    type: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+
+
+class BatchRequest(BaseModel):
+    """Request to run several Blender commands as one job"""
+    ops: List[BatchOperation]
+
+    def to_params(self) -> Dict[str, Any]:
+        return {"ops": [op.model_dump() for op in self.ops]}
+
+
 class RenderRequest(BaseModel):
     """Request to render the current scene"""
     output_path: Optional[str] = None
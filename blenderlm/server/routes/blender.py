@@ -1,4 +1,7 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+import asyncio
+import orjson
+from typing import Optional, Set
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import ValidationError
 from ..models import (
     CodeRequest,
@@ -8,149 +11,172 @@ from ..models import (
     RenderRequest,
     ViewportCaptureRequest,
     ClearSceneRequest,
-    AddCameraRequest
+    AddCameraRequest,
+    BatchRequest
 )
 from ..database import BlenderLMDatabase, JobStatus
 from ..connection import BlenderConnectionManager
+from ..events import JobNotifier
+from ..writer import JobWriter
 import logging
 
 router = APIRouter(prefix="/api/blender", tags=["blender"])
 logger = logging.getLogger("blenderlm.api")
 
+DEPENDENCY_TIMEOUT = 300.0
+TERMINAL_STATUSES = (JobStatus.COMPLETED.value, JobStatus.FAILED.value)
+MAX_WAIT_MS = 5000
+
+# Jobs started by submit_job; held so they are not garbage collected mid-run
+_running_jobs: Set[asyncio.Task] = set()
+
+async def wait_for_job(job_id: str, database: BlenderLMDatabase, notifier: JobNotifier,
+                       timeout: float = DEPENDENCY_TIMEOUT) -> dict:
+    """Wait until the given job has completed or failed and return it"""
+    with notifier.subscribe(job_id) as finished:
+        job = await asyncio.to_thread(database.get_job, job_id)
+        if not job:
+            raise ValueError(f"Job {job_id} not found")
+        if job["status"] in TERMINAL_STATUSES:
+            return job
+        try:
+            await asyncio.wait_for(finished, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Job {job_id} did not finish within {timeout} seconds")
+    job = await asyncio.to_thread(database.get_job, job_id)
+    if not job:
+        # Deleted while we waited
+        raise ValueError(f"Job {job_id} not found")
+    return job
+
 # Helper function (should be imported or moved to a utils file)
-async def process_job(job_id: str, database: BlenderLMDatabase, blender_manager: BlenderConnectionManager):
-    job = database.get_job(job_id)
+async def process_job(job_id: str, database: BlenderLMDatabase, blender_manager: BlenderConnectionManager,
+                      notifier: JobNotifier, depends_on: Optional[str] = None, writer: Optional[JobWriter] = None):
+    # An unstarted writer applies each update directly
+    writer = writer or JobWriter(database)
+    job = await asyncio.to_thread(database.get_job, job_id)
     if not job:
         logger.error(f"Job {job_id} not found")
         return
-    database.update_job(job_id, JobStatus.PROCESSING)
     try:
+        if depends_on:
+            dependency = await wait_for_job(depends_on, database, notifier)
+            if dependency["status"] == JobStatus.FAILED.value:
+                raise RuntimeError(f"Dependency job {depends_on} failed: {dependency.get('error')}")
+        await writer.update(job_id, JobStatus.PROCESSING)
         if not await blender_manager.ensure_connected():
             raise ConnectionError("Could not connect to Blender")
         result = await blender_manager.send_command(job["command_type"], job["params"])
-        database.update_job(job_id, JobStatus.COMPLETED, result=result)
-        logger.info(f"Job {job_id} completed successfully")
+        await writer.update(job_id, JobStatus.COMPLETED, result=result)
+        logger.debug(f"Job {job_id} completed successfully")
     except Exception as e:
         error_message = f"Error processing job: {str(e)}"
         logger.error(f"Job {job_id} failed: {error_message}")
-        database.update_job(job_id, JobStatus.FAILED, error=error_message)
+        await writer.update(job_id, JobStatus.FAILED, error=error_message)
+    finally:
+        notifier.notify(job_id)
 
-@router.get("/scene")
-async def get_scene_info(request: Request, background_tasks: BackgroundTasks):
-    job_id = request.app.state.database.add_job("get_scene_info")
-    background_tasks.add_task(
-        process_job, 
-        job_id, 
-        request.app.state.database, 
-        request.app.state.blender_manager
+async def submit_job(request: Request, command_type: str,
+                     params: Optional[dict] = None, depends_on: Optional[str] = None,
+                     wait_ms: Optional[int] = None):
+    """
+    Queue a job for Blender and return its ID. With wait_ms, wait up to that long for
+    the job; if it finishes in time the response also carries its status and result
+    (or error), saving the client a poll round trip.
+    """
+    state = request.app.state
+    job_id = await state.job_writer.enqueue(command_type, params)
+    # Start the job now rather than through BackgroundTasks, which would hold it until
+    # the response is sent and run a request's tasks one after another
+    task = asyncio.create_task(
+        process_job(job_id, state.database, state.blender_manager, state.job_notifier,
+                    depends_on=depends_on, writer=state.job_writer)
     )
-    return {"job_id": job_id}
+    _running_jobs.add(task)
+    task.add_done_callback(_running_jobs.discard)
+    if not wait_ms:
+        return {"job_id": job_id}
+    try:
+        job = await wait_for_job(job_id, state.database, state.job_notifier,
+                                 timeout=min(wait_ms, MAX_WAIT_MS) / 1000)
+    except TimeoutError:
+        return {"job_id": job_id}
+    return {"job_id": job_id, "status": job["status"], "result": job["result"], "error": job["error"]}
+
+async def run_command(request: Request, command_type: str, params: Optional[dict] = None):
+    """Send a read-only command straight to Blender and return its result, bypassing the job queue"""
+    blender_manager = request.app.state.blender_manager
+    if not await blender_manager.ensure_connected():
+        raise HTTPException(status_code=503, detail="Could not connect to Blender")
+    try:
+        return await blender_manager.send_command(command_type, params)
+    except Exception as e:
+        logger.error(f"{command_type} failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Error processing job: {e}")
+
+@router.get("/scene")
+async def get_scene_info(request: Request, depends_on: Optional[str] = None, wait_ms: Optional[int] = None,
+                         direct: bool = False):
+    # direct=true reads straight from Blender and returns the result instead of a job ID
+    if direct and not depends_on:
+        return await run_command(request, "get_scene_info")
+    return await submit_job(request, "get_scene_info", None, depends_on=depends_on, wait_ms=wait_ms)
 
 @router.get("/objects/{name}")
-async def get_object_info(name: str, request: Request, background_tasks: BackgroundTasks):
-    job_id = request.app.state.database.add_job("get_object_info", {"name": name})
-    background_tasks.add_task(
-        process_job, 
-        job_id, 
-        request.app.state.database, 
-        request.app.state.blender_manager
-    )
-    return {"job_id": job_id}
+async def get_object_info(name: str, request: Request, depends_on: Optional[str] = None, wait_ms: Optional[int] = None,
+                          direct: bool = False):
+    # direct=true reads straight from Blender and returns the result instead of a job ID
+    if direct and not depends_on:
+        return await run_command(request, "get_object_info", {"name": name})
+    return await submit_job(request, "get_object_info", {"name": name}, depends_on=depends_on, wait_ms=wait_ms)
 
 @router.post("/viewport")
-async def capture_viewport(request_body: ViewportCaptureRequest, request: Request, background_tasks: BackgroundTasks):
-    job_id = request.app.state.database.add_job("capture_viewport", request_body.to_params())
-    background_tasks.add_task(
-        process_job, 
-        job_id, 
-        request.app.state.database, 
-        request.app.state.blender_manager
-    )
-    return {"job_id": job_id}
+async def capture_viewport(request_body: ViewportCaptureRequest, request: Request, depends_on: Optional[str] = None, wait_ms: Optional[int] = None):
+    return await submit_job(request, "capture_viewport", request_body.to_params(), depends_on=depends_on, wait_ms=wait_ms)
 
 @router.post("/objects")
-async def create_object(request_body: CreateObjectRequest, request: Request, background_tasks: BackgroundTasks):
+async def create_object(request_body: CreateObjectRequest, request: Request, depends_on: Optional[str] = None, wait_ms: Optional[int] = None):
     try:
-        job_id = request.app.state.database.add_job("create_object", request_body.to_params())
-        background_tasks.add_task(
-            process_job, 
-            job_id, 
-            request.app.state.database, 
-            request.app.state.blender_manager
-        )
-        return {"job_id": job_id}
+        return await submit_job(request, "create_object", request_body.to_params(), depends_on=depends_on, wait_ms=wait_ms)
     except Exception as e:
         logger.error(f"Error creating object: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 @router.put("/objects/{name}")
-async def modify_object(name: str, request_body: ModifyObjectRequest, request: Request, background_tasks: BackgroundTasks):
-    if request_body.name is None or request_body.name != name:
-        request_body.name = name
-    job_id = request.app.state.database.add_job("modify_object", request_body.to_params())
-    background_tasks.add_task(
-        process_job, 
-        job_id, 
-        request.app.state.database, 
-        request.app.state.blender_manager
-    )
-    return {"job_id": job_id}
+async def modify_object(name: str, request_body: ModifyObjectRequest, request: Request, depends_on: Optional[str] = None, wait_ms: Optional[int] = None):
+    request_body.name = name
+    return await submit_job(request, "modify_object", request_body.to_params(), depends_on=depends_on, wait_ms=wait_ms)
 
 @router.delete("/objects/{name}")
-async def delete_object(name: str, request: Request, background_tasks: BackgroundTasks):
-    job_id = request.app.state.database.add_job("delete_object", {"name": name})
-    background_tasks.add_task(
-        process_job, 
-        job_id, 
-        request.app.state.database, 
-        request.app.state.blender_manager
-    )
-    return {"job_id": job_id}
+async def delete_object(name: str, request: Request, depends_on: Optional[str] = None, wait_ms: Optional[int] = None):
+    return await submit_job(request, "delete_object", {"name": name}, depends_on=depends_on, wait_ms=wait_ms)
 
 @router.post("/materials")
-async def set_material(request_body: MaterialRequest, request: Request, background_tasks: BackgroundTasks):
-    job_id = request.app.state.database.add_job("set_material", request_body.to_params())
-    background_tasks.add_task(
-        process_job, 
-        job_id, 
-        request.app.state.database, 
-        request.app.state.blender_manager
-    )
-    return {"job_id": job_id}
+async def set_material(request_body: MaterialRequest, request: Request, depends_on: Optional[str] = None, wait_ms: Optional[int] = None):
+    return await submit_job(request, "set_material", request_body.to_params(), depends_on=depends_on, wait_ms=wait_ms)
 
 @router.post("/render")
-async def render_scene(request_body: RenderRequest, request: Request, background_tasks: BackgroundTasks):
-    job_id = request.app.state.database.add_job("render_scene", request_body.to_params())
-    background_tasks.add_task(
-        process_job, 
-        job_id, 
-        request.app.state.database, 
-        request.app.state.blender_manager
-    )
-    return {"job_id": job_id}
-
-@router.post("/code")
-async def execute_code(request_body: CodeRequest, request: Request, background_tasks: BackgroundTasks):
-    job_id = request.app.state.database.add_job("execute_code", {"code": request_body.code})
-    background_tasks.add_task(
-        process_job, 
-        job_id, 
-        request.app.state.database, 
-        request.app.state.blender_manager
-    )
-    return {"job_id": job_id}
+async def render_scene(request_body: RenderRequest, request: Request, depends_on: Optional[str] = None, wait_ms: Optional[int] = None):
+    return await submit_job(request, "render_scene", request_body.to_params(), depends_on=depends_on, wait_ms=wait_ms)
+
+@router.post("/code", openapi_extra={
+    "requestBody": {"required": True, "content": {"application/json": {"schema": CodeRequest.model_json_schema()}}}
+})
+async def execute_code(request: Request, depends_on: Optional[str] = None, wait_ms: Optional[int] = None):
+    # The code is opaque to the server, so decode the body directly instead of
+    # validating a model around a potentially large script
+    try:
+        code = orjson.loads(await request.body())["code"]
+    except (orjson.JSONDecodeError, KeyError, TypeError):
+        raise HTTPException(status_code=422, detail="Request body must be a JSON object with a 'code' string")
+    if not isinstance(code, str):
+        raise HTTPException(status_code=422, detail="Request body must be a JSON object with a 'code' string")
+    return await submit_job(request, "execute_code", {"code": code}, depends_on=depends_on, wait_ms=wait_ms)
 
 @router.post("/scene/clear")
-async def clear_scene(request_body: ClearSceneRequest, request: Request, background_tasks: BackgroundTasks):
+async def clear_scene(request_body: ClearSceneRequest, request: Request, depends_on: Optional[str] = None, wait_ms: Optional[int] = None):
     try:
-        job_id = request.app.state.database.add_job("clear_scene", request_body.to_params())
-        background_tasks.add_task(
-            process_job, 
-            job_id, 
-            request.app.state.database, 
-            request.app.state.blender_manager
-        )
-        return {"job_id": job_id}
+        return await submit_job(request, "clear_scene", request_body.to_params(), depends_on=depends_on, wait_ms=wait_ms)
     except ValidationError as ve:
         logger.error(f"Validation error clearing scene: {ve}")
         print(f"Error JSON: {ve.json()}")
@@ -160,12 +186,10 @@ async def clear_scene(request_body: ClearSceneRequest, request: Request, backgro
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 @router.post("/camera")
-async def add_camera(request_body: AddCameraRequest, request: Request, background_tasks: BackgroundTasks):
-    job_id = request.app.state.database.add_job("add_camera", request_body.to_params())
-    background_tasks.add_task(
-        process_job, 
-        job_id, 
-        request.app.state.database, 
-        request.app.state.blender_manager
-    )
-    return {"job_id": job_id}
+async def add_camera(request_body: AddCameraRequest, request: Request, depends_on: Optional[str] = None, wait_ms: Optional[int] = None):
+    return await submit_job(request, "add_camera", request_body.to_params(), depends_on=depends_on, wait_ms=wait_ms)
+
+@router.post("/batch")
+async def run_batch(request_body: BatchRequest, request: Request, depends_on: Optional[str] = None, wait_ms: Optional[int] = None):
+    """Run several commands in a single Blender round trip; the job result has one response per op"""
+    return await submit_job(request, "batch", request_body.to_params(), depends_on=depends_on, wait_ms=wait_ms)
@@ -1,18 +1,131 @@
-from fastapi import APIRouter, HTTPException, Request
-from typing import List
+import asyncio
+import os
+import tempfile
+import orjson
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, StreamingResponse
+from typing import List, Optional, Set
 from ..models import JobInfo
+from .blender import TERMINAL_STATUSES, wait_for_job
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
+# Only these commands produce images, and only files under the system temp directory
+# (where the addon writes by default) or BLENDERLM_OUTPUT_DIRS are served
+IMAGE_COMMANDS = ("capture_viewport", "render_scene")
+IMAGE_DIRS = [
+    os.path.realpath(directory)
+    for directory in [tempfile.gettempdir(), *os.environ.get("BLENDERLM_OUTPUT_DIRS", "").split(os.pathsep)]
+    if directory
+]
+
+def _job_image_path(job: dict) -> Optional[str]:
+    """The resolved image file a capture or render job wrote, if it may be served"""
+    if job["command_type"] not in IMAGE_COMMANDS:
+        return None
+    result = job.get("result") or {}
+    image_path = result.get("filepath") or result.get("output_path")
+    if not image_path:
+        return None
+    image_path = os.path.realpath(image_path)
+    if not any(image_path.startswith(os.path.join(directory, "")) for directory in IMAGE_DIRS):
+        return None
+    return image_path if os.path.isfile(image_path) else None
+
 @router.get("/", response_model=List[JobInfo])
 async def list_jobs(request: Request):
     """List pending jobs"""
-    return request.app.state.database.list_pending_jobs()
+    return await asyncio.to_thread(request.app.state.database.list_pending_jobs)
 
 @router.get("/{job_id}", response_model=JobInfo)
 async def get_job(job_id: str, request: Request):
     """Get job status and result"""
-    job = request.app.state.database.get_job(job_id)
+    job = await asyncio.to_thread(request.app.state.database.get_job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job
+
+@router.get("/{job_id}/image")
+async def get_job_image(job_id: str, request: Request):
+    """Return the raw image written by a viewport capture or render job"""
+    job = await asyncio.to_thread(request.app.state.database.get_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    image_path = _job_image_path(job)
+    if not image_path:
+        raise HTTPException(status_code=404, detail="No image available for this job")
+    return FileResponse(image_path)
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request):
+    """Stream job status as server-sent events until the job completes or fails"""
+    database = request.app.state.database
+    notifier = request.app.state.job_notifier
+    if not await asyncio.to_thread(database.get_job, job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        with notifier.subscribe(job_id) as finished:
+            job = await asyncio.to_thread(database.get_job, job_id)
+            if job and job["status"] not in TERMINAL_STATUSES:
+                yield b"data: " + orjson.dumps(job) + b"\n\n"
+                await finished
+                job = await asyncio.to_thread(database.get_job, job_id)
+        if not job:
+            # Deleted while streaming (e.g. by cleanup); end the stream with an error event
+            job = {"id": job_id, "status": "failed", "result": None, "error": "Job not found"}
+            yield b"event: error\ndata: " + orjson.dumps(job) + b"\n\n"
+            return
+        yield b"data: " + orjson.dumps(job) + b"\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+@router.websocket("/ws")
+async def job_updates(websocket: WebSocket):
+    """
+    Push job completions over a single WebSocket. Clients send
+    {"type": "subscribe", "job_id": ...} for each job and receive one
+    {"job_id", "status", "result", "error"} message when it finishes, or
+    {"job_id", "status": "timeout"} if it is still running after the wait limit.
+    Malformed messages get {"type": "error", "error": ...} back.
+    """
+    await websocket.accept()
+    database = websocket.app.state.database
+    notifier = websocket.app.state.job_notifier
+    send_lock = asyncio.Lock()
+    watchers: Set[asyncio.Task] = set()
+
+    async def watch(job_id: str):
+        try:
+            job = await wait_for_job(job_id, database, notifier)
+            message = {"job_id": job_id, "status": job["status"], "result": job["result"], "error": job["error"]}
+        except ValueError:
+            message = {"job_id": job_id, "status": "failed", "result": None, "error": "Job not found"}
+        except TimeoutError:
+            # Tell the client to stop waiting here and fall back to the event stream or polling
+            message = {"job_id": job_id, "status": "timeout"}
+        await send(message)
+
+    async def send(message: dict):
+        async with send_lock:
+            await websocket.send_text(orjson.dumps(message).decode())
+
+    try:
+        while True:
+            try:
+                message = orjson.loads(await websocket.receive_text())
+            except orjson.JSONDecodeError:
+                message = None
+            if not isinstance(message, dict):
+                await send({"type": "error", "error": "Messages must be JSON objects"})
+                continue
+            if message.get("type") == "subscribe" and isinstance(message.get("job_id"), str):
+                task = asyncio.create_task(watch(message["job_id"]))
+                watchers.add(task)
+                task.add_done_callback(watchers.discard)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in watchers:
+            task.cancel()
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
 from typing import Optional, List
 from ..models import (
@@ -18,7 +19,7 @@ logger = logging.getLogger("blenderlm.api")
 @router.get("/", response_model=ProjectListResponse)
 async def list_projects(request: Request, status: Optional[str] = None, limit: int = 50):
     try:
-        projects = request.app.state.database.list_projects(status=status, limit=limit)
+        projects = await asyncio.to_thread(request.app.state.database.list_projects, status=status, limit=limit)
         return ProjectListResponse(
             projects=[ProjectInfo(**project) for project in projects],
             total_count=len(projects)
@@ -30,17 +31,15 @@ async def list_projects(request: Request, status: Optional[str] = None, limit: i
 @router.post("/")
 async def create_project(request_body: CreateProjectRequest, request: Request, background_tasks: BackgroundTasks):
     try:
-        project_id = request.app.state.database.create_project(
+        project_id, job_id = await asyncio.to_thread(
+            request.app.state.database.create_project_with_job,
             name=request_body.name,
+            command_type="new_project",
+            params={"clear_scene": True},
             description=request_body.description,
             file_path=None,
             metadata=request_body.metadata
         )
-        job_id = request.app.state.database.add_job(
-            command_type="new_project",
-            params={"clear_scene": True},
-            project_id=project_id
-        )
         async def process_and_update_project(job_id, database, blender_manager, project_id):
             # This function should be imported from a shared location
             pass
@@ -51,7 +50,7 @@ async def create_project(request_body: CreateProjectRequest, request: Request, b
             request.app.state.blender_manager,
             project_id
         )
-        project = request.app.state.database.get_project(project_id)
+        project = await asyncio.to_thread(request.app.state.database.get_project, project_id)
         if not project:
             raise HTTPException(status_code=500, detail="Failed to create project")
         return {"project": ProjectInfo(**project), "job_id": job_id}
@@ -63,7 +62,7 @@ async def create_project(request_body: CreateProjectRequest, request: Request, b
 
 @router.get("/{project_id}", response_model=ProjectInfo)
 async def get_project(project_id: str, request: Request):
-    project = request.app.state.database.get_project(project_id)
+    project = await asyncio.to_thread(request.app.state.database.get_project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return ProjectInfo(**project)
@@ -71,7 +70,8 @@ async def get_project(project_id: str, request: Request):
 @router.put("/{project_id}", response_model=ProjectInfo)
 async def update_project(project_id: str, request_body: UpdateProjectRequest, request: Request):
     try:
-        success = request.app.state.database.update_project(
+        success = await asyncio.to_thread(
+            request.app.state.database.update_project,
             project_id=project_id,
             name=request_body.name,
             description=request_body.description,
@@ -81,7 +81,7 @@ async def update_project(project_id: str, request_body: UpdateProjectRequest, re
         )
         if not success:
             raise HTTPException(status_code=404, detail="Project not found")
-        project = request.app.state.database.get_project(project_id)
+        project = await asyncio.to_thread(request.app.state.database.get_project, project_id)
         return ProjectInfo(**project)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -92,7 +92,7 @@ async def update_project(project_id: str, request_body: UpdateProjectRequest, re
 @router.delete("/{project_id}")
 async def delete_project(project_id: str, request: Request):
     try:
-        success = request.app.state.database.delete_project(project_id)
+        success = await asyncio.to_thread(request.app.state.database.delete_project, project_id)
         if not success:
             raise HTTPException(status_code=404, detail="Project not found")
         return {"message": "Project deleted successfully"}
@@ -106,7 +106,7 @@ async def load_project(request_body: LoadProjectRequest, request: Request, backg
         project_id = None
         file_path = request_body.file_path
         if request_body.project_id:
-            project = request.app.state.database.get_project(request_body.project_id)
+            project = await asyncio.to_thread(request.app.state.database.get_project, request_body.project_id)
             if not project:
                 raise HTTPException(status_code=404, detail="Project not found")
             project_id = request_body.project_id
@@ -114,10 +114,10 @@ async def load_project(request_body: LoadProjectRequest, request: Request, backg
                 file_path = project["file_path"]
             elif not file_path:
                 raise HTTPException(status_code=400, detail="No file path available for this project")
-            request.app.state.database.update_project_last_opened(project_id)
+            await asyncio.to_thread(request.app.state.database.update_project_last_opened, project_id)
         if not file_path:
             raise HTTPException(status_code=400, detail="File path is required")
-        job_id = request.app.state.database.add_job(
+        job_id = await request.app.state.job_writer.enqueue(
             command_type="load_project",
             params={"file_path": file_path},
             project_id=project_id
@@ -141,11 +141,11 @@ async def load_project(request_body: LoadProjectRequest, request: Request, backg
 @router.post("/save")
 async def save_project(request_body: SaveProjectRequest, request: Request, background_tasks: BackgroundTasks):
     try:
-        project = request.app.state.database.get_project(request_body.project_id)
+        project = await asyncio.to_thread(request.app.state.database.get_project, request_body.project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         file_path = request_body.file_path or project["file_path"]
-        job_id = request.app.state.database.add_job(
+        job_id = await request.app.state.job_writer.enqueue(
             command_type="save_project",
             params={
                 "file_path": file_path,
@@ -158,7 +158,8 @@ async def save_project(request_body: SaveProjectRequest, request: Request, backg
             lambda: None,
         )
         if request_body.file_path and request_body.file_path != project["file_path"]:
-            request.app.state.database.update_project(
+            await asyncio.to_thread(
+                request.app.state.database.update_project,
                 project_id=request_body.project_id,
                 file_path=request_body.file_path
             )
@@ -176,7 +177,7 @@ async def save_project(request_body: SaveProjectRequest, request: Request, backg
 
 @router.get("/current")
 async def get_current_project_info(request: Request, background_tasks: BackgroundTasks):
-    job_id = request.app.state.database.add_job("get_project_info")
+    job_id = await request.app.state.job_writer.enqueue("get_project_info")
     # This function should be imported from a shared location
     background_tasks.add_task(
         lambda: None,
@@ -186,10 +187,10 @@ async def get_current_project_info(request: Request, background_tasks: Backgroun
 @router.get("/{project_id}/jobs", response_model=List[JobInfo])
 async def list_project_jobs(project_id: str, request: Request, limit: int = 50):
     try:
-        project = request.app.state.database.get_project(project_id)
+        project = await asyncio.to_thread(request.app.state.database.get_project, project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
-        jobs = request.app.state.database.list_project_jobs(project_id, limit=limit)
+        jobs = await asyncio.to_thread(request.app.state.database.list_project_jobs, project_id, limit=limit)
         return jobs
     except HTTPException:
         raise
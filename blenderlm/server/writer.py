@@ -0,0 +1,113 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple, Union
+from .database import BlenderLMDatabase, JobStatus
+
+
+class JobWriter:
+    """
+    Coalesces job inserts and status updates from concurrent requests. While one
+    batch is being committed, new writes queue up and go out together in the next
+    transaction, so bursts cost one commit rather than one per write.
+    """
+
+    def __init__(self, database: BlenderLMDatabase, max_batch: int = 64):
+        self.database = database
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run(self._queue))
+
+    async def enqueue(self, command_type: str, params: Optional[Dict[str, Any]] = None,
+                      project_id: Optional[str] = None) -> str:
+        """Queue a job insert and return its ID once committed"""
+        if self._queue is None:
+            return await asyncio.to_thread(self.database.add_job, command_type, params, project_id)
+        return await self._submit(True, (command_type, params, project_id))
+
+    async def update(self, job_id: str, status: Union[JobStatus, str], result=None, error=None) -> None:
+        """Queue a job status update and return once it is committed"""
+        if self._queue is None:
+            return await asyncio.to_thread(self.database.update_job, job_id, status, result, error)
+        await self._submit(False, (job_id, status, result, error))
+
+    def _submit(self, is_insert: bool, write: tuple) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((is_insert, write, future))
+        return future
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        batch: List[Tuple[bool, tuple, asyncio.Future]] = []
+        try:
+            while True:
+                batch = []
+                closing = False
+                while not closing and len(batch) < self.max_batch and (not batch or not queue.empty()):
+                    item = await queue.get()
+                    # close() queues None: commit what came before it, then stop
+                    if item is None:
+                        closing = True
+                    else:
+                        batch.append(item)
+                if batch:
+                    await self._write_batch(batch)
+                if closing:
+                    return
+        finally:
+            # Cancelled mid-batch or with writes still queued; never leave a caller waiting
+            error = RuntimeError("Job writer was closed")
+            self._fail(batch, error)
+            while not queue.empty():
+                item = queue.get_nowait()
+                if item is not None:
+                    self._fail([item], error)
+
+    async def _write_batch(self, batch: List[Tuple[bool, tuple, asyncio.Future]]) -> None:
+        """Commit a batch, falling back to one transaction per write if it fails"""
+        # A job's updates are only queued after its insert has committed, so
+        # applying inserts before updates keeps every job in order
+        batch.sort(key=lambda item: not item[0])
+        try:
+            await self._write(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                self._fail(batch, e)
+                return
+            # Retry each write in its own transaction so one bad write only fails its own request
+            for item in batch:
+                try:
+                    await self._write([item])
+                except Exception as item_error:
+                    self._fail([item], item_error)
+
+    async def _write(self, batch: List[Tuple[bool, tuple, asyncio.Future]]) -> None:
+        """Commit a batch in one transaction and resolve its futures"""
+        inserts = [item for item in batch if item[0]]
+        updates = [item for item in batch if not item[0]]
+        job_ids = await asyncio.to_thread(
+            self.database.write_jobs, [write for _, write, _ in inserts], [write for _, write, _ in updates]
+        )
+        for (_, _, future), job_id in zip(inserts, job_ids):
+            if not future.done():
+                future.set_result(job_id)
+        for _, _, future in updates:
+            if not future.done():
+                future.set_result(None)
+
+    @staticmethod
+    def _fail(batch: List[Tuple[bool, tuple, asyncio.Future]], error: Exception) -> None:
+        for _, _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def close(self) -> None:
+        """Commit the writes already queued and stop; later writes go straight to the database"""
+        queue, self._queue = self._queue, None
+        if self._task is not None:
+            queue.put_nowait(None)
+            try:
+                await self._task
+            finally:
+                self._task = None
@@ -0,0 +1,89 @@
+import json
+import socket
+import struct
+import threading
+
+import pytest
+
+
+class FakeBlender:
+    """A minimal stand-in for the addon's socket server, recording every command it runs"""
+
+    def __init__(self, framed=True, on_command=None):
+        # on_command may return a result to send back, "error" to report a failure,
+        # "close" to drop the socket without replying, or "reply_then_close"
+        self.framed = framed
+        self.on_command = on_command
+        self.executed = []
+        self.connections = 0
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(("localhost", 0))
+        self.server.listen(4)
+        self.port = self.server.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                client, _ = self.server.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._handle, args=(client,), daemon=True).start()
+
+    def _handle(self, client):
+        framed = False
+        with client:
+            while True:
+                data = client.recv(65536)
+                if not data:
+                    return
+                command = json.loads(data)
+                if command["type"] == "set_framing":
+                    if not self.framed:
+                        self._reply(client, {"status": "error", "message": "Unknown command type: set_framing"}, False)
+                        continue
+                    self._reply(client, {"status": "success", "result": {"framed": True}}, False)
+                    framed = True
+                    continue
+                self.executed.append(command["type"])
+                action = self.on_command(command) if self.on_command else None
+                if action == "close":
+                    return
+                if action == "error":
+                    self._reply(client, {"status": "error", "message": f"{command['type']} failed"}, framed)
+                    continue
+                result = {"ran": command["type"]} if action in (None, "reply_then_close") else action
+                self._reply(client, {"status": "success", "result": result}, framed)
+                if action == "reply_then_close":
+                    return
+
+    @staticmethod
+    def _reply(client, response, framed):
+        payload = json.dumps(response).encode("utf-8")
+        if framed:
+            payload = struct.pack(">I", len(payload)) + payload
+        client.sendall(payload)
+
+    def close(self):
+        # shutdown() wakes the thread blocked in accept(), so no new connections get through
+        try:
+            self.server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.server.close()
+
+
+@pytest.fixture
+def fake_blender():
+    """Start FakeBlender servers for a test and shut them down afterwards"""
+    servers = []
+
+    def start(**kwargs):
+        server = FakeBlender(**kwargs)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
@@ -0,0 +1,215 @@
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def fake_blender_options():
+    return {}
+
+
+@pytest.fixture
+def blender(fake_blender, fake_blender_options):
+    return fake_blender(**fake_blender_options)
+
+
+def _wait_for_job(api, job_id):
+    for _ in range(100):
+        job = api.get(f"/api/jobs/{job_id}").json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+@pytest.fixture
+def api(blender, tmp_path, monkeypatch):
+    """The API app wired to a FakeBlender and a throwaway database"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("BLENDERLM_DB_PATH", str(tmp_path / "blenderlm.db"))
+    monkeypatch.setenv("BLENDERLM_BLENDER_PORT", str(blender.port))
+    from blenderlm.server.app import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+def test_scene_info_is_queued_by_default(api):
+    response = api.get("/api/blender/scene")
+    assert response.status_code == 200
+    assert "job_id" in response.json()
+
+
+def test_scene_info_direct(api, blender):
+    response = api.get("/api/blender/scene", params={"direct": "true"})
+    assert response.status_code == 200
+    assert response.json() == {"ran": "get_scene_info"}
+
+
+def test_object_info_direct(api, blender):
+    response = api.get("/api/blender/objects/Cube", params={"direct": "true"})
+    assert response.json() == {"ran": "get_object_info"}
+    assert blender.executed == ["get_object_info"]
+
+
+def _finished_job(api, command_type, result):
+    database = api.app.state.database
+    job_id = database.add_job(command_type)
+    database.update_job(job_id, "completed", result=result)
+    return job_id
+
+
+def test_job_image_served_for_captures(api, tmp_path):
+    image = tmp_path / "capture.png"
+    image.write_bytes(b"\x89PNG")
+    job_id = _finished_job(api, "capture_viewport", {"filepath": str(image)})
+    response = api.get(f"/api/jobs/{job_id}/image")
+    assert response.status_code == 200
+    assert response.content == b"\x89PNG"
+
+
+def test_job_image_refused_for_other_commands(api, tmp_path):
+    image = tmp_path / "capture.png"
+    image.write_bytes(b"\x89PNG")
+    job_id = _finished_job(api, "execute_code", {"filepath": str(image)})
+    assert api.get(f"/api/jobs/{job_id}/image").status_code == 404
+
+
+def test_job_image_refused_outside_output_dirs(api):
+    job_id = _finished_job(api, "render_scene", {"output_path": "/etc/passwd"})
+    assert api.get(f"/api/jobs/{job_id}/image").status_code == 404
+
+
+def test_health_reports_connection(api):
+    assert api.get("/health").json() == {"status": "ok", "blender_connected": True}
+
+
+def _run_batch(command):
+    if command["type"] == "batch":
+        return [{"status": "success", "result": {"ran": op["type"]}} for op in command["params"]["ops"]]
+    return None
+
+
+@pytest.mark.parametrize("fake_blender_options", [{"on_command": _run_batch}])
+def test_batch_endpoint_runs_ops_in_one_job(api, blender):
+    response = api.post(
+        "/api/blender/batch",
+        json={"ops": [{"type": "get_scene_info"}, {"type": "delete_object", "params": {"name": "Cube"}}]},
+        params={"wait_ms": 2000},
+    )
+    assert response.json()["result"] == [
+        {"status": "success", "result": {"ran": "get_scene_info"}},
+        {"status": "success", "result": {"ran": "delete_object"}},
+    ]
+    assert blender.executed == ["batch"]
+
+
+@pytest.mark.parametrize("fake_blender_options", [{"on_command": _run_batch}])
+def test_batch_job_status_carries_responses(api, blender):
+    job_id = api.post("/api/blender/batch", json={"ops": [{"type": "get_scene_info"}]}).json()["job_id"]
+    job = _wait_for_job(api, job_id)
+    assert job["status"] == "completed"
+    assert job["result"] == [{"status": "success", "result": {"ran": "get_scene_info"}}]
+
+
+def _slow_code(command):
+    if command["type"] == "execute_code":
+        time.sleep(0.2)
+    return None
+
+
+@pytest.mark.parametrize("fake_blender_options", [{"on_command": _slow_code}])
+def test_depends_on_runs_after_the_dependency(api, blender):
+    first = api.post("/api/blender/code", json={"code": "pass"}).json()["job_id"]
+    second = api.get("/api/blender/scene", params={"depends_on": first}).json()["job_id"]
+    assert _wait_for_job(api, second)["status"] == "completed"
+    assert blender.executed == ["execute_code", "get_scene_info"]
+
+
+@pytest.mark.parametrize("fake_blender_options", [{"on_command": lambda c: "error" if c["type"] == "execute_code" else None}])
+def test_depends_on_fails_when_the_dependency_fails(api, blender):
+    first = api.post("/api/blender/code", json={"code": "raise"}).json()["job_id"]
+    second = api.get("/api/blender/scene", params={"depends_on": first}).json()["job_id"]
+    job = _wait_for_job(api, second)
+    assert job["status"] == "failed"
+    assert first in job["error"]
+    assert blender.executed == ["execute_code"]
+
+
+def test_wait_ms_returns_the_result_inline(api):
+    response = api.post("/api/blender/code", json={"code": "pass"}, params={"wait_ms": 2000}).json()
+    assert response["status"] == "completed"
+    assert response["result"] == {"ran": "execute_code"}
+    assert response["error"] is None
+
+
+@pytest.mark.parametrize("fake_blender_options", [{"on_command": lambda c: {"job_id": "made-by-the-script"}}])
+def test_wait_ms_result_containing_job_id_stays_wrapped(api, blender):
+    response = api.post("/api/blender/code", json={"code": "pass"}, params={"wait_ms": 2000}).json()
+    assert response["job_id"] != "made-by-the-script"
+    assert response["status"] == "completed"
+    assert response["result"] == {"job_id": "made-by-the-script"}
+
+
+@pytest.mark.parametrize("fake_blender_options", [{"on_command": lambda c: "error"}])
+def test_wait_ms_reports_failures_inline(api, blender):
+    response = api.post("/api/blender/code", json={"code": "raise"}, params={"wait_ms": 2000}).json()
+    assert response["status"] == "failed"
+    assert "execute_code failed" in response["error"]
+
+
+@pytest.mark.parametrize("fake_blender_options", [{"on_command": _slow_code}])
+def test_wait_ms_falls_back_to_the_job_id(api, blender):
+    response = api.post("/api/blender/code", json={"code": "pass"}, params={"wait_ms": 20})
+    job_id = response.json()["job_id"]
+    assert _wait_for_job(api, job_id)["result"] == {"ran": "execute_code"}
+
+
+@pytest.mark.parametrize("fake_blender_options", [{"on_command": _slow_code}])
+def test_websocket_pushes_job_completion(api, blender):
+    job_id = api.post("/api/blender/code", json={"code": "pass"}).json()["job_id"]
+    with api.websocket_connect("/api/jobs/ws") as websocket:
+        websocket.send_json({"type": "subscribe", "job_id": job_id})
+        websocket.send_json({"type": "subscribe", "job_id": "missing"})
+        messages = {message["job_id"]: message for message in (websocket.receive_json(), websocket.receive_json())}
+    assert messages[job_id] == {"job_id": job_id, "status": "completed", "result": {"ran": "execute_code"}, "error": None}
+    assert messages["missing"]["error"] == "Job not found"
+
+
+def test_event_stream_is_not_gzipped(api):
+    job_id = api.post("/api/blender/code", json={"code": "pass"}, params={"wait_ms": 2000}).json()["job_id"]
+    with api.stream("GET", f"/api/jobs/{job_id}/events", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "content-encoding" not in response.headers
+
+
+def test_large_responses_are_still_gzipped(api):
+    response = api.get("/api/tools", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_websocket_reports_wait_timeouts(api, monkeypatch):
+    from blenderlm.server.routes import jobs
+
+    async def timed_out(job_id, database, notifier):
+        raise TimeoutError(job_id)
+
+    monkeypatch.setattr(jobs, "wait_for_job", timed_out)
+    with api.websocket_connect("/api/jobs/ws") as websocket:
+        websocket.send_json({"type": "subscribe", "job_id": "slow"})
+        assert websocket.receive_json() == {"job_id": "slow", "status": "timeout"}
+
+
+@pytest.mark.parametrize("message", ["[1, 2]", '"subscribe"', "not json"])
+def test_websocket_rejects_non_object_messages(api, message):
+    with api.websocket_connect("/api/jobs/ws") as websocket:
+        websocket.send_text(message)
+        assert websocket.receive_json()["type"] == "error"
+        # The socket stays usable
+        websocket.send_json({"type": "subscribe", "job_id": "missing"})
+        assert websocket.receive_json()["error"] == "Job not found"
@@ -0,0 +1,135 @@
+import asyncio
+import time
+
+import pytest
+
+from blenderlm.server.connection import BlenderConnection, BlenderConnectionManager
+
+
+@pytest.fixture(params=[True, False], ids=["framed", "unframed"])
+def framed(request):
+    return request.param
+
+
+def test_negotiates_framing(fake_blender, framed):
+    blender = fake_blender(framed=framed)
+    connection = BlenderConnection(host="localhost", port=blender.port)
+    try:
+        assert connection.connect()
+        assert connection.framed is framed
+        assert connection.send_command("get_scene_info") == {"ran": "get_scene_info"}
+    finally:
+        connection.disconnect()
+
+
+def test_reconnects_when_blender_closed_an_idle_connection(fake_blender, framed):
+    blender = fake_blender(framed=framed, on_command=lambda c: "reply_then_close" if c["type"] == "first" else None)
+    manager = BlenderConnectionManager(port=blender.port)
+
+    async def run():
+        assert await manager.send_command("first") == {"ran": "first"}
+        time.sleep(0.1)  # let the close reach our socket
+        assert await manager.send_command("second") == {"ran": "second"}
+
+    try:
+        asyncio.run(run())
+    finally:
+        manager.connection.disconnect()
+    assert blender.executed == ["first", "second"]
+    assert blender.connections == 2
+
+
+def test_does_not_resend_when_blender_closes_after_receiving(fake_blender, framed):
+    # The addon closes the socket without replying when it cannot serialize or send
+    # a response; by then the command has run, so it must not be sent again
+    blender = fake_blender(framed=framed, on_command=lambda c: "close")
+    manager = BlenderConnectionManager(port=blender.port)
+
+    async def run():
+        with pytest.raises(Exception):
+            await manager.send_command("execute_code", {"code": "x = 1"})
+
+    try:
+        asyncio.run(run())
+    finally:
+        manager.connection.disconnect()
+    assert blender.executed == ["execute_code"]
+    assert manager.is_connected is False
+
+
+def test_is_alive_detects_a_closed_peer(fake_blender):
+    blender = fake_blender(on_command=lambda c: "reply_then_close")
+    connection = BlenderConnection(host="localhost", port=blender.port)
+    try:
+        assert connection.connect()
+        assert connection.is_alive()
+        connection.send_command("ping")
+        time.sleep(0.1)
+        assert not connection.is_alive()
+    finally:
+        connection.disconnect()
+
+
+def _run_batch(command):
+    if command["type"] == "batch":
+        return [{"status": "success", "result": {"ran": op["type"]}} for op in command["params"]["ops"]]
+    return None
+
+
+def test_batch_window_sends_one_command(fake_blender):
+    blender = fake_blender(on_command=_run_batch)
+    manager = BlenderConnectionManager(port=blender.port, batch_window_ms=50)
+
+    async def run():
+        try:
+            return await asyncio.gather(*(manager.send_command(name) for name in ("a", "b", "c")))
+        finally:
+            await manager.close()
+
+    try:
+        assert asyncio.run(run()) == [{"ran": "a"}, {"ran": "b"}, {"ran": "c"}]
+    finally:
+        manager.connection.disconnect()
+    assert blender.executed == ["batch"]
+
+
+def test_close_fails_commands_waiting_for_the_batch_window():
+    manager = BlenderConnectionManager(batch_window_ms=10_000)
+
+    async def run():
+        pending = [asyncio.ensure_future(manager.send_command(name)) for name in ("a", "b")]
+        await asyncio.sleep(0.01)
+        await manager.close()
+        return await asyncio.wait_for(asyncio.gather(*pending, return_exceptions=True), 1)
+
+    assert all(isinstance(result, ConnectionError) for result in asyncio.run(run()))
+
+
+def test_check_connection_notices_blender_going_away(fake_blender):
+    blender = fake_blender(on_command=lambda c: "reply_then_close")
+    manager = BlenderConnectionManager(port=blender.port)
+
+    async def run():
+        await manager.send_command("ping")
+        assert manager.is_connected
+        blender.close()
+        time.sleep(0.1)
+        return await manager.check_connection()
+
+    try:
+        assert asyncio.run(run()) is False
+    finally:
+        manager.connection.disconnect()
+    assert manager.is_connected is False
+
+
+def test_framed_response_larger_than_one_read(fake_blender):
+    payload = "x" * 3_000_000
+    blender = fake_blender(on_command=lambda c: {"image_base64": payload})
+    connection = BlenderConnection(host="localhost", port=blender.port)
+    try:
+        assert connection.connect()
+        assert connection.framed
+        assert connection.send_command("capture_viewport") == {"image_base64": payload}
+    finally:
+        connection.disconnect()
@@ -0,0 +1,100 @@
+import threading
+
+import pytest
+
+from blenderlm.server.database import BlenderLMDatabase, JobStatus
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = BlenderLMDatabase(str(tmp_path / "blenderlm.db"), max_readers=2)
+    yield db
+    db.close()
+
+
+def _age_jobs(database, hours):
+    with database._get_conn() as conn:
+        conn.execute("UPDATE jobs SET completed_at = completed_at - ?", (hours * 3600,))
+        conn.commit()
+
+
+def test_uses_wal(database):
+    with database._get_conn() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_readers_see_committed_writes(database):
+    job_id = database.add_job("create_object", {"type": "CUBE"})
+    job = database.get_job(job_id)
+    assert job["status"] == JobStatus.PENDING.value
+    assert job["params"] == {"type": "CUBE"}
+    database.update_job(job_id, JobStatus.COMPLETED, result={"name": "Cube"})
+    assert database.get_job(job_id)["result"] == {"name": "Cube"}
+
+
+def test_reader_pool_is_bounded(database):
+    barrier = threading.Barrier(4)
+
+    def read():
+        with database._read_conn():
+            barrier.wait()
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert database._readers.qsize() == database.max_readers
+
+
+def test_reader_connections_are_read_only(database):
+    with database._read_conn() as conn:
+        with pytest.raises(Exception):
+            conn.execute("DELETE FROM jobs")
+
+
+def test_write_jobs_inserts_and_updates_in_order(database):
+    job_id = database.add_job("get_scene_info")
+    (new_id,) = database.write_jobs(
+        [("delete_object", {"name": "Cube"}, None)],
+        [(job_id, JobStatus.PROCESSING, None, None), (job_id, JobStatus.FAILED, None, "boom")],
+    )
+    assert database.get_job(job_id)["error"] == "boom"
+    assert database.get_job(new_id)["command_type"] == "delete_object"
+
+
+def test_create_project_with_job(database):
+    project_id, job_id = database.create_project_with_job("demo", "clear_scene")
+    assert database.get_project(project_id)["name"] == "demo"
+    assert database.get_job(job_id)["project_id"] == project_id
+
+
+def test_clean_old_jobs_deletes_in_batches(database, monkeypatch):
+    job_ids = database.add_jobs([("get_scene_info", None, None)] * 5)
+    for job_id in job_ids[:4]:
+        database.update_job(job_id, JobStatus.COMPLETED, result={"ok": True})
+    _age_jobs(database, 48)
+
+    # The write lock is taken once per batch, not for the whole cleanup
+    acquisitions = 0
+    get_conn = database._get_conn
+
+    def counting_get_conn():
+        nonlocal acquisitions
+        acquisitions += 1
+        return get_conn()
+
+    monkeypatch.setattr(database, "_get_conn", counting_get_conn)
+    assert database.clean_old_jobs(max_age_hours=24, batch_size=2) == 4
+    assert acquisitions == 3
+
+    assert [database.get_job(job_id) for job_id in job_ids[:4]] == [None] * 4
+    assert database.get_job(job_ids[4])["status"] == JobStatus.PENDING.value
+    assert [job["id"] for job in database.list_pending_jobs()] == [job_ids[4]]
+
+
+def test_clean_old_jobs_keeps_recent_jobs(database):
+    job_id = database.add_job("get_scene_info")
+    database.update_job(job_id, JobStatus.COMPLETED)
+    assert database.clean_old_jobs(max_age_hours=24) == 0
+    assert database.get_job(job_id) is not None
@@ -0,0 +1,72 @@
+import asyncio
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+pytest.importorskip("fastapi")
+
+from blenderlm.server.database import BlenderLMDatabase, JobStatus
+from blenderlm.server.events import JobNotifier
+from blenderlm.server.routes.blender import wait_for_job
+from blenderlm.server.routes.jobs import stream_job_events
+
+
+@pytest.fixture
+def state(tmp_path):
+    database = BlenderLMDatabase(str(tmp_path / "blenderlm.db"))
+    yield SimpleNamespace(database=database, job_notifier=JobNotifier())
+    database.close()
+
+
+def _events(chunks):
+    return [orjson.loads(chunk.split(b"data: ", 1)[1]) for chunk in chunks]
+
+
+def test_event_stream_reports_completion(state):
+    job_id = state.database.add_job("get_scene_info")
+
+    async def run():
+        response = await stream_job_events(job_id, SimpleNamespace(app=SimpleNamespace(state=state)))
+        stream = response.body_iterator
+        first = await stream.__anext__()
+        state.database.update_job(job_id, JobStatus.COMPLETED, result={"objects": []})
+        state.job_notifier.notify(job_id)
+        return [first] + [chunk async for chunk in stream]
+
+    events = _events(asyncio.run(run()))
+    assert [event["status"] for event in events] == ["pending", "completed"]
+
+
+def test_event_stream_ends_when_job_is_deleted(state):
+    job_id = state.database.add_job("get_scene_info")
+
+    async def run():
+        response = await stream_job_events(job_id, SimpleNamespace(app=SimpleNamespace(state=state)))
+        stream = response.body_iterator
+        first = await stream.__anext__()
+        with state.database._get_conn() as conn:
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            conn.commit()
+        state.job_notifier.notify(job_id)
+        return [first] + [chunk async for chunk in stream]
+
+    chunks = asyncio.run(run())
+    assert chunks[-1].startswith(b"event: error\n")
+    assert _events(chunks)[-1] == {"id": job_id, "status": "failed", "result": None, "error": "Job not found"}
+
+
+def test_wait_for_job_raises_when_job_is_deleted(state):
+    job_id = state.database.add_job("get_scene_info")
+
+    async def run():
+        waiter = asyncio.ensure_future(wait_for_job(job_id, state.database, state.job_notifier))
+        await asyncio.sleep(0.05)
+        with state.database._get_conn() as conn:
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            conn.commit()
+        state.job_notifier.notify(job_id)
+        with pytest.raises(ValueError):
+            await waiter
+
+    asyncio.run(run())
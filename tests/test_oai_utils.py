@@ -0,0 +1,53 @@
+import asyncio
+from typing import List, Optional
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("PIL")
+pytest.importorskip("httpx")
+
+from blenderlm.client.agents.openai._oai_utils import execute_tool, generate_tool_schema
+
+
+async def place_cube(
+    size: float,
+    location: Optional[List[float]],
+    color: str = "red",
+    session_id: Optional[str] = None,
+    wait_for_result: bool = True,
+    depends_on: Optional[str] = None,
+):
+    """Place a cube."""
+    return {"size": size, "location": location, "color": color,
+            "session_id": session_id, "wait_for_result": wait_for_result}
+
+
+def test_schema_keeps_optional_parameters_as_nullable():
+    parameters = generate_tool_schema(place_cube)["function"]["parameters"]
+    assert parameters["properties"] == {
+        "size": {"type": "number", "description": "Parameter size"},
+        "location": {"type": ["array", "null"], "items": {"type": "number"}, "description": "Parameter location"},
+        "color": {"type": ["string", "null"], "description": "Parameter color"},
+    }
+    # Strict mode: every property is required
+    assert parameters["required"] == ["size", "location", "color"]
+
+
+def test_schema_excludes_client_parameters():
+    properties = generate_tool_schema(place_cube)["function"]["parameters"]["properties"]
+    assert not {"session_id", "wait_for_result", "depends_on"} & set(properties)
+
+
+def test_execute_tool_fills_client_parameters_and_defaults():
+    result = asyncio.run(execute_tool({"place_cube": place_cube}, "place_cube",
+                                      {"size": 2.0, "location": None, "color": None}))
+    assert '"color": "red"' in result
+    assert '"wait_for_result": true' in result
+    assert '"location": null' in result
+
+
+def test_cached_schema_is_not_shared():
+    schema = generate_tool_schema(place_cube)
+    schema["function"]["parameters"]["properties"].clear()
+    assert generate_tool_schema(place_cube)["function"]["parameters"]["properties"]
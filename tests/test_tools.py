@@ -0,0 +1,212 @@
+import asyncio
+import base64
+
+import orjson
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("httpx")
+
+from blenderlm.client.tools import CaptureViewPortResult
+
+PNG = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\xff\xfe"
+
+
+def test_capture_result_dumps_image_as_base64():
+    result = CaptureViewPortResult(filepath="/tmp/capture.png", status="success", image_bytes=PNG)
+    dumped = result.model_dump()
+    assert "image_bytes" not in dumped
+    assert dumped["image_base64"] == base64.b64encode(PNG).decode("ascii")
+
+
+def test_capture_result_json_round_trip():
+    result = CaptureViewPortResult(status="success", image_bytes=PNG)
+    restored = CaptureViewPortResult.model_validate_json(result.model_dump_json())
+    assert restored.image_bytes == PNG
+    assert restored.status == "success"
+
+
+def test_capture_result_without_image():
+    assert CaptureViewPortResult(status="success").model_dump()["image_base64"] is None
+
+
+class _FakeSocket:
+    """Accepts subscriptions and never answers"""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(message)
+
+
+def test_job_subscriber_forgets_timed_out_waiters():
+    from blenderlm.client.tools import _JobSubscriber
+
+    async def run():
+        subscriber = _JobSubscriber("http://localhost:8199")
+        subscriber._connection = _FakeSocket()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(subscriber.wait("job-1"), 0.01)
+        return subscriber
+
+    subscriber = asyncio.run(run())
+    assert subscriber._futures == {}
+    assert len(subscriber._connection.sent) == 1
+
+
+def test_job_subscribers_are_per_event_loop():
+    from blenderlm.client.tools import _subscriber
+
+    async def get():
+        return _subscriber("http://localhost:8199")
+
+    first = asyncio.run(get())
+    assert asyncio.run(get()) is not first
+
+
+def test_cached_scene_info_is_copied_per_caller(monkeypatch):
+    from blenderlm.client import tools
+
+    calls = []
+
+    async def fake_call(*args):
+        calls.append(args)
+        await asyncio.sleep(0.01)
+        return {"objects": [{"name": "Cube"}]}
+
+    monkeypatch.setattr(tools, "_call", fake_call)
+    monkeypatch.setattr(tools, "_RECENT_READS", {})
+
+    async def run():
+        first, second = await asyncio.gather(
+            tools.get_blender_scene_info(None, True), tools.get_blender_scene_info(None, True)
+        )
+        first["objects"].clear()
+        third = await tools.get_blender_scene_info(None, True)
+        return second, third
+
+    second, third = asyncio.run(run())
+    assert len(calls) == 1
+    assert second == third == {"objects": [{"name": "Cube"}]}
+
+
+def test_capture_image_falls_back_to_filepath_when_server_cannot_serve_it(monkeypatch):
+    import httpx
+
+    from blenderlm.client import tools
+
+    async def fake_capture(**kwargs):
+        return {"job_id": "job-1"}
+
+    async def fake_wait(job_id, api_url, session_id):
+        # Written outside the directories the API server will serve from
+        return {"status": "success", "filepath": "/remote/blender/capture.png"}
+
+    async def fake_image(job_id, session_id):
+        request = httpx.Request("GET", f"http://localhost:8199/api/jobs/{job_id}/image")
+        raise httpx.HTTPStatusError("not found", request=request, response=httpx.Response(404, request=request))
+
+    monkeypatch.setattr(tools, "capture_viewport", fake_capture)
+    monkeypatch.setattr(tools, "_wait_for_job_completion", fake_wait)
+    monkeypatch.setattr(tools, "get_job_image", fake_image)
+
+    result = asyncio.run(tools.capture_viewport_image(camera_view=None, session_id=None))
+    assert result == {"status": "success", "filepath": "/remote/blender/capture.png"}
+
+
+def test_resolve_job_unwraps_finished_jobs_without_polling(monkeypatch):
+    from blenderlm.client import tools
+
+    async def no_polling(*args, **kwargs):
+        raise AssertionError("finished jobs must not be polled")
+
+    monkeypatch.setattr(tools, "_wait_for_job_completion", no_polling)
+    envelope = {"job_id": "job-1", "status": "completed", "result": {"job_id": "from-the-script"}, "error": None}
+    result = asyncio.run(tools._resolve_job(envelope, tools.default_api_url, None, True, None))
+    assert result == {"job_id": "from-the-script"}
+
+    failed = {"job_id": "job-2", "status": "failed", "result": None, "error": "boom"}
+    with pytest.raises(Exception, match="boom"):
+        asyncio.run(tools._resolve_job(failed, tools.default_api_url, None, True, None))
+
+
+@pytest.mark.parametrize("bad_url", ["not a url", "ftp://example.com", "http://"])
+def test_bad_tool_url_falls_back_to_the_default(bad_url):
+    import os
+    import subprocess
+    import sys
+
+    result = subprocess.run(
+        [sys.executable, "-c", "from blenderlm.client.tools import default_api_url; print(default_api_url)"],
+        env={**os.environ, "BLENDERLM_TOOL_URL": bad_url},
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "http://localhost:8199"
+
+
+class _ScriptedSocket(_FakeSocket):
+    """Answers every subscription with a fixed status"""
+
+    def __init__(self, status):
+        super().__init__()
+        self.status = status
+        self.replies = asyncio.Queue()
+
+    async def send(self, message):
+        await super().send(message)
+        job_id = orjson.loads(message)["job_id"]
+        self.replies.put_nowait(orjson.dumps({"job_id": job_id, "status": self.status}))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.replies.get()
+
+
+def test_job_subscriber_falls_back_when_the_server_times_out():
+    from blenderlm.client.tools import _EventStreamUnavailable, _JobSubscriber
+
+    async def run():
+        subscriber = _JobSubscriber("http://localhost:8199")
+        subscriber._connection = _ScriptedSocket("timeout")
+        subscriber._reader = asyncio.ensure_future(subscriber._read(subscriber._connection))
+        try:
+            with pytest.raises(_EventStreamUnavailable):
+                await asyncio.wait_for(subscriber.wait("job-1"), 1)
+        finally:
+            subscriber._reader.cancel()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    "tool, args, expected",
+    [
+        ("create_blender_object", ("CUBE", "", 0.0, 0.0, 0.0), {"type": "CUBE", "location": [0.0, 0.0, 0.0]}),
+        ("set_blender_material", ("Cube", [], ""), {"object_name": "Cube"}),
+        ("render_blender_scene", ("", 0, 0), {}),
+        ("add_blender_camera", ([], []), {}),
+        ("capture_viewport", (False, False), {"camera_view": False, "return_base64": False}),
+    ],
+)
+def test_empty_optional_fields_are_left_to_the_server(monkeypatch, tool, args, expected):
+    import httpx
+
+    from blenderlm.client import tools
+
+    bodies = []
+
+    class FakeClient:
+        async def request(self, method, path, content=None, **kwargs):
+            bodies.append(orjson.loads(content))
+            return httpx.Response(200, json={"job_id": "job-1"}, request=httpx.Request(method, path))
+
+    monkeypatch.setattr(tools, "get_shared_client", lambda *args: FakeClient())
+    result = asyncio.run(getattr(tools, tool)(*args, None, False))
+    assert result == {"job_id": "job-1"}
+    assert bodies == [expected]
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from blenderlm.server.database import BlenderLMDatabase, JobStatus
+from blenderlm.server.writer import JobWriter
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = BlenderLMDatabase(str(tmp_path / "blenderlm.db"))
+    yield db
+    db.close()
+
+
+def _count_writes(database, monkeypatch):
+    calls = []
+    write_jobs = database.write_jobs
+
+    def counting_write_jobs(jobs, updates):
+        calls.append((len(jobs), len(updates)))
+        return write_jobs(jobs, updates)
+
+    monkeypatch.setattr(database, "write_jobs", counting_write_jobs)
+    return calls
+
+
+def test_concurrent_writes_are_coalesced(database, monkeypatch):
+    calls = _count_writes(database, monkeypatch)
+
+    async def run():
+        writer = JobWriter(database)
+        writer.start()
+        job_ids = await asyncio.gather(*(writer.enqueue("get_scene_info") for _ in range(20)))
+        await asyncio.gather(*(writer.update(job_id, JobStatus.COMPLETED) for job_id in job_ids))
+        await writer.close()
+        return job_ids
+
+    job_ids = asyncio.run(run())
+    assert len(set(job_ids)) == 20
+    assert all(database.get_job(job_id)["status"] == JobStatus.COMPLETED.value for job_id in job_ids)
+    assert len(calls) < 40
+
+
+def test_bad_write_only_fails_its_own_request(database):
+    job_id = database.add_job("get_scene_info")
+
+    async def run():
+        writer = JobWriter(database)
+        writer.start()
+        results = await asyncio.gather(
+            writer.enqueue("clear_scene"),
+            writer.update(job_id, "not-a-status"),
+            writer.update(job_id, JobStatus.COMPLETED, result={"ok": True}),
+            return_exceptions=True,
+        )
+        await writer.close()
+        return results
+
+    new_id, bad, good = asyncio.run(run())
+    assert isinstance(bad, ValueError)
+    assert good is None
+    assert database.get_job(new_id)["command_type"] == "clear_scene"
+    assert database.get_job(job_id)["result"] == {"ok": True}
+
+
+def test_unstarted_writer_writes_directly(database):
+    async def run():
+        writer = JobWriter(database)
+        job_id = await writer.enqueue("get_scene_info")
+        await writer.update(job_id, JobStatus.FAILED, error="boom")
+        return job_id
+
+    assert database.get_job(asyncio.run(run()))["error"] == "boom"
+
+
+def test_close_commits_queued_writes(database):
+    async def run():
+        writer = JobWriter(database)
+        writer.start()
+        pending = [asyncio.ensure_future(writer.enqueue("get_scene_info")) for _ in range(5)]
+        await asyncio.sleep(0)
+        await writer.close()
+        return await asyncio.wait_for(asyncio.gather(*pending), 1)
+
+    job_ids = asyncio.run(run())
+    assert all(database.get_job(job_id) for job_id in job_ids)
+
+
+def test_cancelled_writer_fails_pending_writes(database):
+    async def run():
+        writer = JobWriter(database)
+        writer.start()
+        pending = [asyncio.ensure_future(writer.enqueue("get_scene_info")) for _ in range(5)]
+        await asyncio.sleep(0)
+        writer._task.cancel()
+        return await asyncio.wait_for(asyncio.gather(*pending, return_exceptions=True), 1)
+
+    for result in asyncio.run(run()):
+        assert isinstance(result, (str, RuntimeError))